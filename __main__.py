@@ -2,41 +2,13 @@
 
 import argparse
 import logging
-import os
 import sys
-import webbrowser
-from pathlib import Path
 
-from .config.config import config
-from .scripts.download_forecast import download_forecast
-from .scripts.upload_data import upload_data
 from .utils.logging_config import setup_logging
 
 
-def setup_cli():
-    """Set up command-line interface."""
-    parser = argparse.ArgumentParser(
-        description="Oracle ETL Tool for Oracle database operations",
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    
-    # Global options
-    parser.add_argument(
-        "--reset-credentials",
-        action="store_true",
-        help="Reset the stored database credentials"
-    )
-    
-    parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug logging"
-    )
-    
-    # Subcommands
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-    
-    # Download forecast command
+def p_download(subparsers):
+    """Attach the download-forecast subcommand."""
     download_parser = subparsers.add_parser(
         "download-forecast",
         help="Download BOM EO Forecast data and export to Excel/Parquet"
@@ -56,8 +28,10 @@ def setup_cli():
         action="store_true",
         help="Open Google Drive in browser after completion"
     )
-    
-    # Upload data command
+
+
+def p_upload(subparsers):
+    """Attach the upload-data subcommand."""
     upload_parser = subparsers.add_parser(
         "upload-data",
         help="Upload data from a file to the Oracle database"
@@ -73,14 +47,90 @@ def setup_cli():
         default="t_ibp_cons_rdc",
         help="Target table name (default: t_ibp_cons_rdc)"
     )
+
+
+# Subcommand builders, attached on demand by setup_cli
+SUBPARSER_BUILDERS = {
+    "download-forecast": p_download,
+    "upload-data": p_upload,
+}
+
+
+def _add_global_options(parser):
+    """Add options shared by every command."""
+    parser.add_argument(
+        "--reset-credentials",
+        action="store_true",
+        help="Reset the stored database credentials"
+    )
+    
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug logging"
+    )
+
+
+def setup_cli(commands=None):
+    """Set up command-line interface.
+    
+    Args:
+        commands: Names of the subcommands to attach (if None, attaches all)
+        
+    Returns:
+        ArgumentParser: Configured parser
+    """
+    parser = argparse.ArgumentParser(
+        description="Oracle ETL Tool for Oracle database operations",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    
+    # Global options
+    _add_global_options(parser)
+    
+    # Subcommands
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    
+    if commands is None:
+        commands = SUBPARSER_BUILDERS
+    for name in commands:
+        SUBPARSER_BUILDERS[name](subparsers)
     
     return parser
 
 
+def _detect_commands(argv):
+    """Work out which subparsers the final parse actually needs.
+    
+    Args:
+        argv: Command-line arguments (without the program name)
+        
+    Returns:
+        list or None: Subcommand names to attach (None means all)
+    """
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    _add_global_options(pre_parser)
+    pre_parser.add_argument("command", nargs="?")
+    
+    pre_args, remaining = pre_parser.parse_known_args(argv)
+    
+    if pre_args.command in SUBPARSER_BUILDERS:
+        return [pre_args.command]
+    
+    # --reset-credentials on its own needs no subcommand at all
+    help_requested = "-h" in remaining or "--help" in remaining
+    if pre_args.command is None and pre_args.reset_credentials and not help_requested:
+        return []
+    
+    # Help, unknown commands and errors get the full parser
+    return None
+
+
 def main():
     """Main entry point for the CLI application."""
-    parser = setup_cli()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    parser = setup_cli(_detect_commands(argv))
+    args = parser.parse_args(argv)
     
     # Set up logging
     log_level = logging.DEBUG if args.debug else logging.INFO
@@ -88,25 +138,32 @@ def main():
     
     # Handle reset credentials
     if args.reset_credentials:
-        credentials_file = config.get('app', 'credentials_file')
-        if os.path.exists(credentials_file):
-            os.remove(credentials_file)
-            logger.info(f"Credentials reset - deleted {credentials_file}")
+        from .utils.credentials import credential_manager
+        
+        if credential_manager.reset_credentials():
+            logger.info(f"Credentials reset - deleted {credential_manager.credentials_file}")
         else:
             logger.info("No credentials file found to reset")
     
-    # Execute the appropriate command
+    # Execute the appropriate command (heavy imports are deferred until needed)
     if args.command == "download-forecast":
+        from .scripts.download_forecast import download_forecast
+        
         download_forecast(
             generate_excel=(not args.no_excel),
             generate_parquet=(not args.no_parquet),
             open_drive=args.open_drive
         )
     elif args.command == "upload-data":
+        from .scripts.upload_data import upload_data
+        
         upload_data(
             filename=args.file,
             tablename=args.table
         )
+    elif args.reset_credentials:
+        # Credentials reset was the whole request
+        return
     else:
         # No command specified, show help
         parser.print_help()
@@ -1,9 +1,22 @@
 """Configuration module for Oracle ETL Tool."""
 
+import logging
 import os
+import pickle
+import tempfile
+import types
 import yaml
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Sentinel for lazily computed values that may legitimately be None
+_UNSET = object()
+
 
 class Config:
     """Configuration class to load and access settings."""
@@ -22,42 +35,138 @@ class Config:
         if not self._loaded:
             self._config_dir = Path(__file__).parent
             self._config_file = self._config_dir / "config.yaml"
+            self._cache_file = self._config_dir / "config.yaml.pickle"
             self._config = self._load_config()
+            self._build_caches()
             self._loaded = True
     
     def _load_config(self):
-        """Load configuration from YAML file."""
-        if not self._config_file.exists():
+        """Load configuration from YAML file.
+        
+        The parsed configuration is pickled next to the YAML file and reused
+        for as long as it is at least as new as the YAML file itself.
+        """
+        try:
+            yaml_mtime = self._config_file.stat().st_mtime
+        except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {self._config_file}")
         
+        cached = self._load_cached_config(yaml_mtime)
+        if cached is not None:
+            return cached
+        
         with open(self._config_file, 'r') as f:
-            return yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=_YAML_LOADER)
+        
+        self._save_cached_config(loaded)
+        return loaded
+    
+    def _load_cached_config(self, yaml_mtime):
+        """Load the pickled configuration if it is still fresh."""
+        try:
+            if self._cache_file.stat().st_mtime < yaml_mtime:
+                return None
+            with open(self._cache_file, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache {self._cache_file}: {e}")
+            return None
+    
+    def _save_cached_config(self, loaded):
+        """Write the parsed configuration to the pickle cache.
+        
+        The pickle is written to a temporary file next to the cache and moved
+        into place, so a concurrent or interrupted run never sees a partial file.
+        """
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self._config_dir, prefix=".config.yaml.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(loaded, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            # Read-only installs simply fall back to parsing the YAML
+            logger.debug(f"Could not write config cache {self._cache_file}: {e}")
+    
+    def _build_caches(self):
+        """Pre-compute lookup tables from the loaded configuration."""
+        # Every key path (including intermediate sections) maps to its value
+        self._flat = {}
+        self._flatten(self._config, ())
+        
+        # Host details and "host:port/service" strings per host key
+        self._hosts = {}
+        self._dsn_template = {}
+        hosts = self._flat.get(('database', 'hosts')) or {}
+        for host_key, details in hosts.items():
+            host = details.get('host')
+            port = details.get('port')
+            service = details.get('service')
+            self._hosts[host_key] = (host, port, service)
+            self._dsn_template[host_key] = f"{host}:{port}/{service}"
+        
+        self._oracle_lib_dir = _UNSET
+        
+        # Attribute-access view, e.g. config.tree.database.hosts.sp1.host
+        self.tree = self._to_namespace(self._config)
+    
+    def _flatten(self, node, prefix):
+        """Recursively index a configuration node by its key path."""
+        self._flat[prefix] = node
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self._flatten(value, prefix + (key,))
+    
+    @classmethod
+    def _to_namespace(cls, node):
+        """Recursively convert configuration dicts to SimpleNamespace objects."""
+        if isinstance(node, dict):
+            return types.SimpleNamespace(
+                **{str(key): cls._to_namespace(value) for key, value in node.items()}
+            )
+        if isinstance(node, list):
+            return [cls._to_namespace(item) for item in node]
+        return node
     
     def get(self, *keys, default=None):
         """Get configuration value using dot notation."""
-        config = self._config
-        for key in keys:
-            if key in config:
-                config = config[key]
-            else:
-                return default
-        return config
+        return self._flat.get(keys, default)
     
     def get_oracle_client_path(self):
-        """Get the first available Oracle client path."""
-        paths = self.get('oracle_client', 'paths', default=[])
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
+        """Get the first available Oracle client path.
+        
+        The candidate paths are only checked on the first call.
+        """
+        if self._oracle_lib_dir is _UNSET:
+            self._oracle_lib_dir = None
+            for path in self.get('oracle_client', 'paths', default=[]):
+                if os.path.exists(path):
+                    self._oracle_lib_dir = path
+                    break
+        return self._oracle_lib_dir
+    
+    def get_host_details(self, host_key='sp1'):
+        """Get connection details for a configured host.
+        
+        Args:
+            host_key: Key for host configuration in config file
+            
+        Returns:
+            tuple: (host, port, service)
+        """
+        return self._hosts.get(host_key, (None, None, None))
     
     def get_database_url(self, schema, username, password, host_key='sp1'):
         """Generate database connection URL."""
-        host = self.get('database', 'hosts', host_key, 'host')
-        port = self.get('database', 'hosts', host_key, 'port')
-        service = self.get('database', 'hosts', host_key, 'service')
-        
-        return f"{host}:{port}/{service}"
+        url = self._dsn_template.get(host_key)
+        if url is None:
+            url = "{}:{}/{}".format(*self.get_host_details(host_key))
+        return url
     
     def get_query(self, query_name):
         """Get SQL query by name."""
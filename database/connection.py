@@ -1,17 +1,77 @@
 """Database connection management."""
 
 import logging
+import operator
 import os
 
 import cx_Oracle
 import pandas as pd
+import pyarrow as pa
 import sqlalchemy as sa
+from sqlalchemy.pool import NullPool
 
 from ..config.config import config
 from ..utils.credentials import credential_manager
 
 logger = logging.getLogger(__name__)
 
+# pandas 2.0+ can build Arrow-backed frames straight from read_sql
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split(".")[:2])
+DEFAULT_DTYPE_BACKEND = "pyarrow" if _PANDAS_VERSION >= (2, 0) else None
+
+# Pre-built accessor for the SQLAlchemy dialect settings on config.tree
+_get_dialect_driver = operator.attrgetter('database.dialect', 'database.driver')
+
+# Arrow types for Oracle column types (NUMBER is decided by precision/scale)
+_ARROW_TYPES = {
+    cx_Oracle.DB_TYPE_VARCHAR: pa.string(),
+    cx_Oracle.DB_TYPE_NVARCHAR: pa.string(),
+    cx_Oracle.DB_TYPE_CHAR: pa.string(),
+    cx_Oracle.DB_TYPE_NCHAR: pa.string(),
+    cx_Oracle.DB_TYPE_LONG: pa.string(),
+    cx_Oracle.DB_TYPE_ROWID: pa.string(),
+    cx_Oracle.DB_TYPE_DATE: pa.timestamp("us"),
+    cx_Oracle.DB_TYPE_TIMESTAMP: pa.timestamp("us"),
+    cx_Oracle.DB_TYPE_TIMESTAMP_TZ: pa.timestamp("us"),
+    cx_Oracle.DB_TYPE_TIMESTAMP_LTZ: pa.timestamp("us"),
+    cx_Oracle.DB_TYPE_BINARY_FLOAT: pa.float64(),
+    cx_Oracle.DB_TYPE_BINARY_DOUBLE: pa.float64(),
+    cx_Oracle.DB_TYPE_BINARY_INTEGER: pa.int64(),
+    cx_Oracle.DB_TYPE_BOOLEAN: pa.bool_(),
+    cx_Oracle.DB_TYPE_RAW: pa.binary(),
+    cx_Oracle.DB_TYPE_LONG_RAW: pa.binary(),
+    cx_Oracle.DB_TYPE_INTERVAL_DS: pa.duration("us"),
+}
+
+
+def _arrow_schema(description, rows):
+    """Build the Arrow schema of a result set from cursor.description.
+    
+    Integer NUMBER(p, 0) columns (p <= 18) map to int64 and every other
+    NUMBER to float64, so the schema does not depend on which values the
+    first rows happen to hold. Columns of other types fall back to the type
+    of the given rows (string if those are all NULL).
+    """
+    fields = []
+    for i, (name, db_type, _, _, precision, scale, _) in enumerate(description):
+        if db_type is cx_Oracle.DB_TYPE_NUMBER:
+            arrow_type = pa.int64() if scale == 0 and 0 < (precision or 0) <= 18 else pa.float64()
+        else:
+            arrow_type = _ARROW_TYPES.get(db_type)
+            if arrow_type is None:
+                arrow_type = pa.array([row[i] for row in rows]).type
+                if pa.types.is_null(arrow_type):
+                    arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _rows_to_table(rows, schema):
+    """Convert fetched rows to an Arrow table with the given schema."""
+    columns = zip(*rows) if rows else ([] for _ in schema)
+    arrays = [pa.array(list(values), type=field.type) for values, field in zip(columns, schema)]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
 
 class DatabaseConnectionError(Exception):
     """Exception raised for database connection errors."""
@@ -19,7 +79,16 @@ class DatabaseConnectionError(Exception):
 
 
 class OracleConnection:
-    """Oracle database connection manager."""
+    """Oracle database connection manager.
+    
+    Sessions come from a process-wide cx_Oracle session pool (one per host
+    key and user), so repeated connections reuse already authenticated sessions.
+    """
+    
+    # Process-wide state shared by all instances
+    _client_initialized = False
+    _pools = {}
+    _dsn_cache = {}
     
     def __init__(self, host_key='sp1'):
         """Initialize connection manager.
@@ -29,13 +98,45 @@ class OracleConnection:
         """
         self.host_key = host_key
         self.connection = None
+        
+        # Session pool the current connection was acquired from
+        self._pool = None
         self.engine = None
         
         # Set up Oracle client
         self._setup_oracle_client()
         
+        # Connection strings for this host (built once per process)
+        self.dsn_tns, self.engine_url, self.address = self._get_dsn(host_key)
+        
+    @classmethod
+    def _get_dsn(cls, host_key):
+        """Get the cached DSN, engine URL and display address for a host.
+        
+        Args:
+            host_key: Key for host configuration in config file
+            
+        Returns:
+            tuple: (dsn_tns, engine_url, address)
+        """
+        cached = cls._dsn_cache.get(host_key)
+        if cached is None:
+            dialect, driver = _get_dialect_driver(config.tree)
+            host, port, service = config.get_host_details(host_key)
+            
+            cached = (
+                cx_Oracle.makedsn(host, port, service_name=service),
+                f"{dialect}+{driver}://",
+                config.get_database_url(None, None, None, host_key=host_key)
+            )
+            cls._dsn_cache[host_key] = cached
+        return cached
+        
     def _setup_oracle_client(self):
-        """Set up Oracle client libraries."""
+        """Set up Oracle client libraries (once per process)."""
+        if OracleConnection._client_initialized:
+            return
+            
         lib_dir = config.get_oracle_client_path()
         if not lib_dir:
             raise DatabaseConnectionError(
@@ -45,18 +146,19 @@ class OracleConnection:
         try:
             # Initialize Oracle client
             cx_Oracle.init_oracle_client(lib_dir=lib_dir)
+            OracleConnection._client_initialized = True
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to initialize Oracle client: {e}")
             
-    def connect(self, username=None, password=None):
-        """Connect to the Oracle database.
+    def _get_pool(self, username=None, password=None):
+        """Get the session pool for this host and user, creating it on first use.
         
         Args:
             username: Database username (will prompt if None)
             password: Database password (will prompt if None)
             
         Returns:
-            connection: Oracle connection object
+            pool: cx_Oracle session pool
         """
         # Get credentials if not provided
         if username is None or password is None:
@@ -65,19 +167,49 @@ class OracleConnection:
         if not username or not password:
             raise DatabaseConnectionError("No credentials provided")
             
-        try:
-            # Get connection details from config
-            host = config.get('database', 'hosts', self.host_key, 'host')
-            port = config.get('database', 'hosts', self.host_key, 'port')
-            service = config.get('database', 'hosts', self.host_key, 'service')
+        # Pools are per user, so explicit credentials never get another user's sessions
+        key = (self.host_key, username)
+        pool = OracleConnection._pools.get(key)
+        if pool is not None:
+            return pool
             
-            # Create DSN and connection
-            dsn_tns = cx_Oracle.makedsn(host, port, service_name=service)
-            self.connection = cx_Oracle.connect(user=username, password=password, dsn=dsn_tns)
-            logger.info(f"Connected to Oracle database {host}:{port}/{service}")
+        # Create session pool
+        pool = cx_Oracle.SessionPool(
+            user=username,
+            password=password,
+            dsn=self.dsn_tns,
+            min=1,
+            max=4,
+            increment=1,
+            threaded=True,
+            getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT
+        )
+        OracleConnection._pools[key] = pool
+        logger.info(f"Created Oracle session pool for {username} on {self.address}")
+        
+        return pool
+        
+    def connect(self, username=None, password=None):
+        """Connect to the Oracle database.
+        
+        Args:
+            username: Database username (will prompt if None)
+            password: Database password (will prompt if None)
+            
+        Returns:
+            connection: Oracle connection object
+        """
+        try:
+            pool = self._get_pool(username, password)
+            self.connection = pool.acquire()
+            self._pool = pool
+            logger.info(f"Connected to Oracle database {self.address}")
             
             return self.connection
             
+        except DatabaseConnectionError:
+            raise
+            
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to connect to database: {e}")
             
@@ -91,37 +223,32 @@ class OracleConnection:
         Returns:
             engine: SQLAlchemy engine
         """
-        # Get credentials if not provided
-        if username is None or password is None:
-            username, password = credential_manager.get_credentials()
-            
-        if not username or not password:
-            raise DatabaseConnectionError("No credentials provided")
-            
         try:
-            # Get connection details from config
-            dialect = config.get('database', 'dialect')
-            driver = config.get('database', 'driver')
-            host = config.get('database', 'hosts', self.host_key, 'host')
-            port = config.get('database', 'hosts', self.host_key, 'port')
-            service = config.get('database', 'hosts', self.host_key, 'service')
-            
-            # Create engine
-            engine_path = f"{dialect}+{driver}://{username}:{password}@{host}:{port}/?service_name={service}"
-            self.engine = sa.create_engine(engine_path)
-            logger.info(f"Created SQLAlchemy engine for {host}:{port}/{service}")
+            pool = self._get_pool(username, password)
+            
+            # Create engine; connections are borrowed from (and returned to) the session pool
+            self.engine = sa.create_engine(
+                self.engine_url,
+                creator=pool.acquire,
+                poolclass=NullPool
+            )
+            logger.info(f"Created SQLAlchemy engine for {self.address}")
             
             return self.engine
             
+        except DatabaseConnectionError:
+            raise
+            
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to create SQLAlchemy engine: {e}")
             
-    def query_to_dataframe(self, sql, params=None):
+    def query_to_dataframe(self, sql, params=None, dtype_backend=DEFAULT_DTYPE_BACKEND):
         """Execute a SQL query and return the results as a DataFrame.
         
         Args:
             sql: SQL query to execute
             params: Parameters for query
+            dtype_backend: pandas dtype backend ("pyarrow" on pandas 2.0+, None for NumPy dtypes)
             
         Returns:
             df: Pandas DataFrame with query results
@@ -129,21 +256,118 @@ class OracleConnection:
         if self.connection is None:
             self.connect()
             
+        read_kwargs = {}
+        if dtype_backend:
+            read_kwargs["dtype_backend"] = dtype_backend
+            
         try:
             logger.info("Executing SQL query and loading results to DataFrame")
-            df = pd.read_sql(sql, self.connection, params=params)
+            df = pd.read_sql(sql, self.connection, params=params, **read_kwargs)
             logger.info(f"Query returned {df.shape[0]} rows and {df.shape[1]} columns")
             return df
             
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to execute query: {e}")
+
+    def query_to_dataframe_iter(self, sql, params=None, chunksize=500000):
+        """Execute a SQL query and yield the results as DataFrame chunks.
+
+        The cursor fetch size matches the chunk size, so each chunk is a
+        single round trip to the database.
+
+        Args:
+            sql: SQL query to execute
+            params: Parameters for query
+            chunksize: Number of rows per chunk
+
+        Yields:
+            DataFrame: Chunk of query results
+        """
+        if self.connection is None:
+            self.connect()
+
+        cursor = self.connection.cursor()
+        cursor.arraysize = chunksize
+        cursor.prefetchrows = chunksize + 1
+
+        try:
+            logger.info(f"Executing SQL query and streaming results in chunks of {chunksize} rows")
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            columns = [column[0] for column in cursor.description]
+
+            total_rows = 0
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                total_rows += len(rows)
+                yield pd.DataFrame.from_records(rows, columns=columns)
+
+            logger.info(f"Query returned {total_rows} rows and {len(columns)} columns")
+
+        except cx_Oracle.Error as e:
+            raise DatabaseConnectionError(f"Failed to execute query: {e}")
+
+        finally:
+            cursor.close()
+
+    def query_to_arrow_iter(self, sql, params=None, chunksize=500000):
+        """Execute a SQL query and yield the results as Arrow table chunks.
+        
+        Every chunk has the same schema, derived from the cursor description.
+        At least one (possibly empty) chunk is yielded.
+        
+        Args:
+            sql: SQL query to execute
+            params: Parameters for query
+            chunksize: Number of rows per chunk
+            
+        Yields:
+            pyarrow.Table: Chunk of query results
+        """
+        if self.connection is None:
+            self.connect()
+            
+        cursor = self.connection.cursor()
+        cursor.arraysize = chunksize
+        cursor.prefetchrows = chunksize + 1
+        
+        try:
+            logger.info(f"Executing SQL query and streaming results in chunks of {chunksize} rows")
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+                
+            rows = cursor.fetchmany()
+            schema = _arrow_schema(cursor.description, rows)
+            
+            total_rows = 0
+            while True:
+                total_rows += len(rows)
+                yield _rows_to_table(rows, schema)
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                    
+            logger.info(f"Query returned {total_rows} rows and {len(schema)} columns")
+            
+        except cx_Oracle.Error as e:
+            raise DatabaseConnectionError(f"Failed to execute query: {e}")
+            
+        finally:
+            cursor.close()
             
     def close(self):
-        """Close the database connection."""
+        """Release the database connection back to the session pool."""
         if self.connection:
-            self.connection.close()
+            self._pool.release(self.connection)
             self.connection = None
-            logger.info("Database connection closed")
+            self._pool = None
+            logger.info("Database connection released")
             
     def __enter__(self):
         """Context manager entry."""
@@ -19,13 +19,28 @@ class QueryBuilder:
         query = config.get_query('bomfc_dpv_detail_hist')
         if not query:
             logger.warning("Forecast query not found in config, using default query")
+            # Range predicate on the bare column keeps validity_date index-friendly
             query = """
-            SELECT *
-            FROM network_rw.bomfc_dpv_detail_hist
-            WHERE TRUNC(validity_date) = (SELECT TRUNC(MAX(validity_date)) FROM network_rw.bomfc_dpv_detail_hist)
+            WITH m AS (SELECT MAX(validity_date) AS mx FROM network_rw.bomfc_dpv_detail_hist)
+            SELECT /*+ PARALLEL(4) */ t.*
+            FROM network_rw.bomfc_dpv_detail_hist t, m
+            WHERE t.validity_date >= TRUNC(m.mx)
+              AND t.validity_date < TRUNC(m.mx) + 1
             """
         return query
     
+    @staticmethod
+    def get_table_spec(table_name):
+        """Get the configured layout of a table.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            dict: Table spec with "columns" (and optionally "schema"), or None if not configured
+        """
+        return config.get('tables', table_name)
+    
     @staticmethod
     def get_max_validity_date(table_name, schema=None):
         """Build a query to get the maximum validity date from a table.
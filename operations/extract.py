@@ -5,6 +5,9 @@ import os
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from ..config.config import config
 from ..database.connection import OracleConnection
@@ -12,6 +15,74 @@ from ..database.queries import QueryBuilder
 
 logger = logging.getLogger(__name__)
 
+# Block size used by the Arrow CSV reader (larger blocks parallelize better)
+CSV_BLOCK_SIZE = 64 << 20
+
+# Use the calamine Excel reader when it is installed (much faster than openpyxl);
+# pandas only knows the engine from 2.2 onwards
+try:
+    import python_calamine  # noqa: F401
+    _PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split(".")[:2])
+    EXCEL_ENGINE = "calamine" if _PANDAS_VERSION >= (2, 2) else None
+except ImportError:
+    EXCEL_ENGINE = None
+
+
+# Read options for files with a known layout, keyed by their target table.
+# Declaring dtypes up front skips pandas' per-column type inference.
+KNOWN_SCHEMAS = {
+    "t_ibp_cons_rdc": {
+        "dtype": {
+            "Validity_Date": str,
+            "Timezone": "category",
+            "Part_ID": str,
+            "Product_ID": str,
+            "Product_Description": str,
+            "Last_Submitted_Date": str,
+            "Location_ID": str,
+            "Key_Figure": "category",
+            "Planned_Month": str,
+            "FINAL_CON_DEM": "float64",
+        },
+    },
+}
+
+
+def _arrow_to_pandas(table):
+    """Convert an Arrow table to pandas, keeping Arrow-backed columns if possible."""
+    if hasattr(pd, "ArrowDtype"):
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def _read_delimited(file_path, delimiter, encoding, as_arrow, known_schema=None, **kwargs):
+    """Read a delimited text file with the Arrow CSV reader.
+    
+    Extra pandas-specific keyword arguments fall back to pd.read_csv. A
+    known schema adds its declared dtypes and parses with pandas' pyarrow
+    engine (unless the file is read in chunks, which that engine cannot do).
+    """
+    if known_schema is not None:
+        if known_schema not in KNOWN_SCHEMAS:
+            raise ValueError(f"Unknown schema: {known_schema}")
+        for key, value in KNOWN_SCHEMAS[known_schema].items():
+            kwargs.setdefault(key, value)
+        if "chunksize" not in kwargs and not kwargs.get("iterator"):
+            kwargs.setdefault("engine", "pyarrow")
+    
+    if kwargs:
+        df = pd.read_csv(file_path, sep=delimiter, encoding=encoding, **kwargs)
+        return pa.Table.from_pandas(df, preserve_index=False) if as_arrow else df
+    
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(encoding=encoding, block_size=CSV_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+    )
+    if as_arrow:
+        return table
+    return _arrow_to_pandas(table)
+
 
 class DataExtractor:
     """Class for extracting data from various sources."""
@@ -41,23 +112,71 @@ class DataExtractor:
         return df
     
     @staticmethod
-    def extract_from_csv(file_path, sep=",", encoding="utf-8", **kwargs):
+    def extract_to_parquet(output_path, query=None, params=None, chunksize=500000, compression="snappy"):
+        """Stream data from the Oracle database straight into a Parquet file.
+        
+        Each fetched chunk is appended as a row group, so the full result set
+        is never held in memory as a single DataFrame. The file schema comes
+        from the query's column types, so all-NULL or integer-only first
+        chunks do not narrow it.
+        
+        Args:
+            output_path: Path to output Parquet file
+            query: SQL query (if None, will use default forecast query)
+            params: Parameters for the query
+            chunksize: Number of rows fetched and written per row group
+            compression: Compression method
+            
+        Returns:
+            int: Number of rows written
+        """
+        logger.info(f"Streaming data from Oracle database to Parquet file: {output_path}")
+        
+        # Use default forecast query if none provided
+        if query is None:
+            query = QueryBuilder.get_forecast_query()
+            
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        writer = None
+        row_count = 0
+        
+        try:
+            with OracleConnection() as conn:
+                # Chunks share one schema derived from the column types
+                for table in conn.query_to_arrow_iter(query, params, chunksize=chunksize):
+                    if writer is None:
+                        writer = pq.ParquetWriter(output_path, table.schema, compression=compression)
+                    writer.write_table(table)
+                    row_count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+                
+        logger.info(f"Extracted {row_count} rows from database to {output_path}")
+        return row_count
+    
+    @staticmethod
+    def extract_from_csv(file_path, sep=",", encoding="utf-8", as_arrow=False, known_schema=None, **kwargs):
         """Extract data from CSV file.
         
         Args:
             file_path: Path to CSV file
             sep: Column separator (default: comma)
             encoding: File encoding (default: utf-8)
-            **kwargs: Additional arguments for pd.read_csv
+            as_arrow: Return a pyarrow Table instead of a DataFrame
+            known_schema: Name of a KNOWN_SCHEMAS entry whose dtypes to apply
+            **kwargs: Additional arguments for pd.read_csv (disables the Arrow reader)
             
         Returns:
-            DataFrame: Extracted data
+            DataFrame: Extracted data (or pyarrow Table if as_arrow)
         """
         logger.info(f"Extracting data from CSV file: {file_path}")
         
         try:
-            df = pd.read_csv(file_path, sep=sep, encoding=encoding, **kwargs)
-            logger.info(f"Extracted {df.shape[0]} rows from CSV file")
+            df = _read_delimited(file_path, sep, encoding, as_arrow, known_schema, **kwargs)
+            logger.info(f"Extracted {len(df)} rows from CSV file")
             return df
             
         except Exception as e:
@@ -78,6 +197,9 @@ class DataExtractor:
         """
         logger.info(f"Extracting data from Excel file: {file_path}")
         
+        if EXCEL_ENGINE:
+            kwargs.setdefault("engine", EXCEL_ENGINE)
+        
         try:
             df = pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
             logger.info(f"Extracted {df.shape[0]} rows from Excel file")
@@ -88,22 +210,24 @@ class DataExtractor:
             raise ValueError(f"Failed to extract data from Excel: {str(e)}")
     
     @staticmethod
-    def extract_from_tab_delimited(file_path, encoding="utf-8", **kwargs):
+    def extract_from_tab_delimited(file_path, encoding="utf-8", as_arrow=False, known_schema=None, **kwargs):
         """Extract data from tab-delimited file.
         
         Args:
             file_path: Path to tab-delimited file
             encoding: File encoding (default: utf-8)
-            **kwargs: Additional arguments for pd.read_csv
+            as_arrow: Return a pyarrow Table instead of a DataFrame
+            known_schema: Name of a KNOWN_SCHEMAS entry whose dtypes to apply
+            **kwargs: Additional arguments for pd.read_csv (disables the Arrow reader)
             
         Returns:
-            DataFrame: Extracted data
+            DataFrame: Extracted data (or pyarrow Table if as_arrow)
         """
         logger.info(f"Extracting data from tab-delimited file: {file_path}")
         
         try:
-            df = pd.read_csv(file_path, sep="\t", encoding=encoding, **kwargs)
-            logger.info(f"Extracted {df.shape[0]} rows from tab-delimited file")
+            df = _read_delimited(file_path, "\t", encoding, as_arrow, known_schema, **kwargs)
+            logger.info(f"Extracted {len(df)} rows from tab-delimited file")
             return df
             
         except Exception as e:
@@ -111,25 +235,61 @@ class DataExtractor:
             raise ValueError(f"Failed to extract data from tab-delimited file: {str(e)}")
     
     @staticmethod
-    def list_files_in_directory(directory="."):
+    def iter_tab_delimited(file_path, chunksize=200000, encoding="utf-8", known_schema=None, **kwargs):
+        """Extract data from tab-delimited file in chunks.
+        
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            file_path: Path to tab-delimited file
+            chunksize: Number of rows per chunk
+            encoding: File encoding (default: utf-8)
+            known_schema: Name of a KNOWN_SCHEMAS entry whose dtypes to apply
+            **kwargs: Additional arguments for pd.read_csv
+            
+        Yields:
+            DataFrame: Chunk of extracted data
+        """
+        logger.info(f"Extracting data from tab-delimited file in chunks of {chunksize} rows: {file_path}")
+        
+        try:
+            reader = _read_delimited(file_path, "\t", encoding, False, known_schema,
+                                     chunksize=chunksize, **kwargs)
+            
+            total_rows = 0
+            with reader:
+                for chunk in reader:
+                    total_rows += len(chunk)
+                    yield chunk
+                    
+            logger.info(f"Extracted {total_rows} rows from tab-delimited file")
+            
+        except Exception as e:
+            logger.exception(f"Error extracting data from tab-delimited file: {file_path}")
+            raise ValueError(f"Failed to extract data from tab-delimited file: {str(e)}")
+    
+    @staticmethod
+    def list_files_in_directory(directory=".", extensions=None):
         """List all files in the specified directory.
         
         Args:
             directory: Directory path (default: current directory)
+            extensions: Only list files with these extensions, e.g. (".csv", ".txt") (case-insensitive)
             
         Returns:
             dict: Dictionary of {index: filename}
         """
-        files = {}
-        i = 1
+        suffixes = tuple(ext.lower() for ext in extensions) if extensions else None
         
         try:
-            for file in sorted(os.listdir(directory)):
-                if os.path.isfile(os.path.join(directory, file)):
-                    files[i] = file
-                    i += 1
-                    
-            return files
+            # DirEntry.is_file() is answered from the directory read, no extra stat
+            with os.scandir(directory) as entries:
+                names = sorted(
+                    entry.name for entry in entries
+                    if (suffixes is None or entry.name.lower().endswith(suffixes)) and entry.is_file()
+                )
+                
+            return dict(enumerate(names, 1))
             
         except Exception as e:
             logger.exception(f"Error listing files in directory: {directory}")
@@ -1,24 +1,140 @@
 """Data loading operations."""
 
+import functools
+import itertools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import dask.dataframe as da
+import cx_Oracle
 import pandas as pd
-from sqlalchemy import MetaData, Table, inspect
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Column, MetaData, Table, inspect
+
+from ..database.queries import QueryBuilder
 
 logger = logging.getLogger(__name__)
 
+# Data rows that fit on one XLSX sheet (1,048,576 rows minus the header row)
+EXCEL_MAX_ROWS = 1048575
+
+# xlsxwriter options: skip per-cell URL/formula detection. constant_memory is
+# not usable here: to_excel writes column by column and that mode drops cells
+# of rows it has already flushed
+EXCEL_WRITER_OPTIONS = {"strings_to_formulas": False, "strings_to_urls": False}
+
+# Rows bound per executemany() call in bulk inserts
+INSERT_BATCH_SIZE = 10000
+
+
+# Reflected tables keyed on (engine, schema, table_name)
+_table_cache = {}
+
+# Output directories already created by this process
+_ensured_dirs = set()
+
+
+def _ensure_dir(path):
+    """Create a directory once per process (no-op for the current directory)."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+@functools.lru_cache(maxsize=128)
+def _table_exists(engine, schema, table_name):
+    """Check (once per engine/schema/table) whether a table exists."""
+    return inspect(engine).has_table(table_name, schema=schema)
+
+
+def _sorted_groups(series):
+    """Distinct non-null values of a column, sorted (read from the categories when categorical)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return sorted(series.cat.remove_unused_categories().cat.categories)
+    return sorted(series.dropna().unique())
+
+
+def _oracle_input_sizes(df):
+    """Map DataFrame column dtypes to cx_Oracle bind types (None lets the driver decide)."""
+    sizes = []
+    for dtype in df.dtypes:
+        if dtype.kind == "M":
+            sizes.append(cx_Oracle.TIMESTAMP)
+        elif dtype.kind in "iufb":
+            sizes.append(cx_Oracle.NUMBER)
+        else:
+            sizes.append(None)
+    return sizes
+
+
+def _insert_rows(df):
+    """Yield DataFrame rows as plain tuples, with missing values bound as NULL."""
+    if df.isna().values.any():
+        df = df.astype(object).where(df.notna(), None)
+    return df.itertuples(index=False, name=None)
+
 
 class DataLoader:
     """Class for loading data to various destinations."""
     
+    @staticmethod
+    def get_table(engine, table_name, schema=None):
+        """Get the reflected Table for a database table.
+        
+        Tables listed under "tables" in config.yaml are built from their
+        spec; others are reflected once per engine. Either way the result is
+        cached; see invalidate_table_cache().
+        
+        Args:
+            engine: SQLAlchemy engine
+            table_name: Table name
+            schema: Database schema
+            
+        Returns:
+            Table: SQLAlchemy Table object
+        """
+        key = (engine, schema, table_name)
+        table = _table_cache.get(key)
+        if table is None:
+            spec = QueryBuilder.get_table_spec(table_name)
+            if spec:
+                # Configured tables are built from their spec, without any roundtrip
+                table = Table(
+                    table_name,
+                    MetaData(),
+                    *[Column(column) for column in spec['columns']],
+                    schema=schema or spec.get('schema')
+                )
+                _table_cache[key] = table
+                return table
+                
+            metadata = MetaData(schema=schema)
+            metadata.reflect(bind=engine, only=[table_name])
+            
+            table_key = table_name if schema is None else f"{schema}.{table_name}"
+            if table_key not in metadata.tables:
+                raise ValueError(f"Table {table_name} does not exist in the database")
+                
+            table = metadata.tables[table_key]
+            _table_cache[key] = table
+        return table
+    
+    @staticmethod
+    def invalidate_table_cache():
+        """Forget all reflected tables (e.g. after DDL changes)."""
+        _table_cache.clear()
+        _table_exists.cache_clear()
+    
     @staticmethod
     def load_to_excel(df, output_path, sheet_name="DATA", index=False, **kwargs):
         """Load data to Excel file.
         
+        Frames larger than one sheet are spilled over several sheets named
+        DATA_1, DATA_2, ... (using sheet_name as the prefix).
+        
         Args:
             df: DataFrame to save
             output_path: Path to output Excel file
@@ -32,25 +148,39 @@ class DataLoader:
         logger.info(f"Saving {df.shape[0]} rows to Excel file: {output_path}")
         
         # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(output_path))
         
         # Save to Excel
-        df.to_excel(output_path, sheet_name=sheet_name, index=index, **kwargs)
+        with pd.ExcelWriter(
+            output_path,
+            engine="xlsxwriter",
+            engine_kwargs={"options": EXCEL_WRITER_OPTIONS}
+        ) as writer:
+            if len(df) <= EXCEL_MAX_ROWS:
+                df.to_excel(writer, sheet_name=sheet_name, index=index, **kwargs)
+            else:
+                # Slices are views, so no rows are copied
+                for i, start in enumerate(range(0, len(df), EXCEL_MAX_ROWS), 1):
+                    part_df = df.iloc[start:start + EXCEL_MAX_ROWS]
+                    part_df.to_excel(writer, sheet_name=f"{sheet_name}_{i}", index=index, **kwargs)
+                logger.info(f"Split {df.shape[0]} rows over {i} sheets")
         
         logger.info(f"Successfully saved data to: {output_path}")
         return output_path
     
     @staticmethod
-    def load_to_parquet(df, output_dir, name_function=None, engine="auto", compression="snappy", **kwargs):
+    def load_to_parquet(df, output_dir, name_function=None, engine="auto", compression="snappy",
+                        chunksize=5000000, **kwargs):
         """Load data to Parquet files.
         
         Args:
             df: DataFrame to save
             output_dir: Output directory
-            name_function: Function to generate filenames
-            engine: Parquet engine
+            name_function: Function mapping a part number to a filename
+            engine: Parquet engine (kept for compatibility, files are written with pyarrow)
             compression: Compression method
-            **kwargs: Additional arguments for to_parquet
+            chunksize: Maximum number of rows per file
+            **kwargs: Additional arguments for pyarrow.parquet.write_table
             
         Returns:
             str: Path to saved directory
@@ -58,19 +188,44 @@ class DataLoader:
         logger.info(f"Saving {df.shape[0]} rows to Parquet files in: {output_dir}")
         
         # Ensure directory exists
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         
-        # Convert to dask DataFrame for partitioning
-        ddf = da.from_pandas(df, chunksize=5000000)
+        if name_function is None:
+            name_function = lambda i: f"part.{i}.parquet"
         
-        # Save to parquet
-        ddf.to_parquet(
-            output_dir,
-            name_function=name_function,
-            engine=engine,
-            compression=compression,
-            **kwargs
-        )
+        kwargs.setdefault("use_dictionary", True)
+        kwargs.setdefault("data_page_size", 1 << 20)
+        
+        # Convert each part on all cores while the previous part is written by a
+        # background thread (at most two converted parts are held at a time)
+        nthreads = os.cpu_count()
+        pending = None
+        
+        # Infer the schema from the whole frame so every part is converted the
+        # same way (a column that is all-null in the first part must not pin it)
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            # Always write at least one file, even for an empty frame
+            for i, start in enumerate(range(0, max(len(df), 1), chunksize)):
+                table = pa.Table.from_pandas(
+                    df.iloc[start:start + chunksize],
+                    schema=schema,
+                    preserve_index=False,
+                    nthreads=nthreads
+                )
+                
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(
+                    pq.write_table,
+                    table,
+                    os.path.join(output_dir, name_function(i)),
+                    compression=compression,
+                    **kwargs
+                )
+            
+            pending.result()
         
         logger.info(f"Successfully saved data to Parquet files in: {output_dir}")
         return output_dir
@@ -91,7 +246,7 @@ class DataLoader:
         logger.info(f"Saving {df.shape[0]} rows to CSV file: {output_path}")
         
         # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(output_path))
         
         # Save to CSV
         df.to_csv(output_path, index=index, **kwargs)
@@ -118,9 +273,12 @@ class DataLoader:
         logger.info(f"Loading {df.shape[0]} rows to database table: {table_name}")
         
         try:
-            # Check if table exists
-            inspector = inspect(engine)
-            if not inspector.has_table(table_name, schema=schema):
+            # Check if table exists (configured tables are trusted to exist)
+            table_exists = (
+                QueryBuilder.get_table_spec(table_name) is not None
+                or _table_exists(engine, schema, table_name)
+            )
+            if not table_exists:
                 logger.warning(f"Table does not exist: {table_name}")
                 if if_exists == "append" or if_exists == "replace":
                     logger.info(f"Creating table: {table_name}")
@@ -137,6 +295,10 @@ class DataLoader:
                 **kwargs
             )
             
+            # The table was created or dropped and recreated, so forget what we knew
+            if not table_exists or if_exists == "replace":
+                _table_exists.cache_clear()
+            
             logger.info(f"Successfully loaded {df.shape[0]} rows to table: {table_name}")
             return df.shape[0]
             
@@ -145,39 +307,74 @@ class DataLoader:
             raise ValueError(f"Failed to load data to database: {str(e)}")
     
     @staticmethod
-    def bulk_insert_to_database(df, engine, table_name, schema=None):
+    def bulk_insert_to_database(df, engine, table_name, schema=None, batch_size=INSERT_BATCH_SIZE):
         """Perform bulk insert to database table.
         
+        Rows are sent with cx_Oracle's executemany() in batches, using the
+        array interface instead of binding one row at a time. All rows are
+        committed in one transaction; any rejected row rolls it back.
+        
         Args:
-            df: DataFrame to insert
+            df: DataFrame, or iterable of DataFrame chunks with the same columns, to insert
             engine: SQLAlchemy engine
             table_name: Target table name
             schema: Database schema
+            batch_size: Rows per executemany() call
             
         Returns:
             int: Number of rows inserted
         """
-        logger.info(f"Bulk inserting {df.shape[0]} rows to database table: {table_name}")
+        frames = [df] if isinstance(df, pd.DataFrame) else df
+        logger.info(f"Bulk inserting rows to database table: {table_name}")
         
         try:
-            # Get table metadata
-            metadata = MetaData(schema=schema)
-            metadata.reflect(bind=engine, only=[table_name])
+            table = DataLoader.get_table(engine, table_name, schema)
+            # The Table carries the effective schema (falling back to the configured one)
+            schema = table.schema
+            table_columns = {column.name.lower() for column in table.columns}
             
-            if table_name not in metadata.tables:
-                raise ValueError(f"Table {table_name} does not exist in the database")
+            raw_connection = engine.raw_connection()
+            try:
+                cursor = raw_connection.cursor()
+                sql = None
+                inserted = 0
                 
-            table = metadata.tables[table_name if schema is None else f"{schema}.{table_name}"]
-            
-            # Convert DataFrame to records
-            records = df.to_dict(orient='records')
-            
-            # Insert data
-            with engine.begin() as connection:
-                result = connection.execute(table.insert(), records)
+                for frame in frames:
+                    if sql is None:
+                        # Validate the target columns before sending any rows
+                        missing = [col for col in frame.columns if col.lower() not in table_columns]
+                        if missing:
+                            raise ValueError(f"Columns not found in table {table_name}: {', '.join(missing)}")
+                            
+                        sql = QueryBuilder.build_insert_query(table_name, frame.columns.tolist(), schema)
+                        cursor.setinputsizes(*_oracle_input_sizes(frame))
+                    
+                    rows = _insert_rows(frame)
+                    while True:
+                        batch = list(itertools.islice(rows, batch_size))
+                        if not batch:
+                            break
+                        cursor.executemany(sql, batch, batcherrors=True, arraydmlrowcounts=True)
+                        
+                        errors = cursor.getbatcherrors()
+                        if errors:
+                            raise ValueError(
+                                f"{len(errors)} rows rejected; first at batch offset "
+                                f"{errors[0].offset}: {errors[0].message}"
+                            )
+                        inserted += sum(cursor.getarraydmlrowcounts())
+                
+                raw_connection.commit()
                 
-            logger.info(f"Successfully inserted {len(records)} records into {table_name}")
-            return len(records)
+            except Exception:
+                raw_connection.rollback()
+                raise
+                
+            finally:
+                raw_connection.close()
+                
+            logger.info(f"Successfully inserted {inserted} records into {table_name}")
+            return inserted
             
         except Exception as e:
             logger.exception(f"Error bulk inserting to table: {table_name}")
@@ -187,6 +384,11 @@ class DataLoader:
     def export_by_group(df, group_column, output_dir, file_prefix, file_suffix="xlsx", sheet_name="DATA", **kwargs):
         """Export DataFrame to separate files by group.
         
+        Parquet output is written as a single partitioned dataset, with one
+        "<group_column>=<value>" directory per group holding
+        "<file_prefix>_<n>.parquet" files. Partitions being rewritten are
+        cleared first, so re-exporting does not duplicate data.
+        
         Args:
             df: DataFrame to export
             group_column: Column to group by
@@ -197,24 +399,33 @@ class DataLoader:
             **kwargs: Additional arguments for export functions
             
         Returns:
-            list: List of saved file paths
+            list: List of saved file paths (partition directories for Parquet)
         """
         logger.info(f"Exporting data by group column: {group_column}")
         
         # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         
-        # Get unique group values
-        groups = df[group_column].unique()
-        groups = [x for x in groups if not pd.isnull(x)]
-        groups.sort()
+        suffix = file_suffix.lower()
+        if suffix not in ("xlsx", "csv", "parquet"):
+            raise ValueError(f"Unsupported file type: {file_suffix}")
+        
+        # Parquet: let pyarrow write every partition in one pass
+        if suffix == "parquet":
+            grouped_df = df[df[group_column].notna()]
+            kwargs.setdefault("existing_data_behavior", "delete_matching")
+            kwargs.setdefault("basename_template", f"{file_prefix}_{{i}}.parquet")
+            grouped_df.to_parquet(output_dir, partition_cols=[group_column], index=False, **kwargs)
+            
+            groups = _sorted_groups(grouped_df[group_column])
+            saved_files = [os.path.join(output_dir, f"{group_column}={group}") for group in groups]
+            logger.info(f"Exported {grouped_df.shape[0]} rows in {len(groups)} partitions to {output_dir}")
+            return saved_files
         
         saved_files = []
         
-        # Export data for each group
-        for group in groups:
-            # Filter data for this group
-            group_df = df[df[group_column] == group]
+        # Export data for each group (single pass, nulls skipped, sorted by group)
+        for group, group_df in df.groupby(group_column, sort=True, observed=True, dropna=True):
             row_count = group_df.shape[0]
             
             # Create output filename
@@ -222,14 +433,10 @@ class DataLoader:
             output_path = os.path.join(output_dir, filename)
             
             # Export based on file type
-            if file_suffix.lower() == "xlsx":
+            if suffix == "xlsx":
                 group_df.to_excel(output_path, sheet_name=sheet_name, index=False, **kwargs)
-            elif file_suffix.lower() == "csv":
-                group_df.to_csv(output_path, index=False, **kwargs)
-            elif file_suffix.lower() == "parquet":
-                group_df.to_parquet(output_path, index=False, **kwargs)
             else:
-                raise ValueError(f"Unsupported file type: {file_suffix}")
+                group_df.to_csv(output_path, index=False, **kwargs)
             
             logger.info(f"Exported {row_count} rows for {group_column}={group} to {output_path}")
             saved_files.append(output_path)
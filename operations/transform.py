@@ -1,91 +1,215 @@
 """Data transformation operations."""
 
 import logging
+import operator
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from dateutil import relativedelta
 
 logger = logging.getLogger(__name__)
 
 
+def _escape_unicode(value):
+    """Escape non-ASCII characters in a string (other values are returned as is)."""
+    if isinstance(value, str):
+        return value.encode("unicode_escape").decode("utf-8")
+    return value
+
+
+# Operations supported by calculate_derived_metrics
+_OPERATIONS = {
+    "subtract": np.subtract,
+    "add": np.add,
+    "multiply": np.multiply,
+    "divide": np.divide,
+}
+
+# Series operators used for columns that are not numeric (e.g. dates and durations)
+_SERIES_OPERATIONS = {
+    "subtract": operator.sub,
+    "add": operator.add,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
+
+def _numeric_values(series):
+    """Get the values of a numeric Series as a numpy array.
+    
+    Nullable and Arrow-backed numeric columns are converted to float64 with
+    NaN for missing values (plain to_numpy would give an object array holding
+    pd.NA). Returns None for other columns, including datetime and timedelta
+    ones, which are left to the pandas operators.
+    """
+    dtype = series.dtype
+    if not pd.api.types.is_numeric_dtype(dtype):
+        return None
+    if isinstance(dtype, np.dtype):
+        return series.to_numpy()
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _date_parts(dates):
+    """Get year, month, day and quarter of a datetime Series.
+    
+    Naive datetime64 columns are handled with numpy unit casts on the raw
+    array; other datetime dtypes (e.g. timezone-aware) use the .dt accessor.
+    NaT gives NaN, as with .dt.
+    """
+    if not (isinstance(dates.dtype, np.dtype) and dates.dtype.kind == "M"):
+        dt = dates.dt
+        return dt.year, dt.month, dt.day, dt.quarter
+    
+    days = dates.to_numpy(dtype="datetime64[D]")
+    months = days.astype("datetime64[M]")
+    
+    year = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months).astype(np.int64) + 1
+    quarter = (month - 1) // 3 + 1
+    
+    parts = [year, month, day, quarter]
+    missing = np.isnat(days)
+    if missing.any():
+        parts = [np.where(missing, np.nan, part) for part in parts]
+    
+    return tuple(pd.Series(part, index=dates.index) for part in parts)
+
+
 class DataTransformer:
     """Class for transforming dataframes."""
     
     @staticmethod
-    def clean_encoding(df):
+    def clean_encoding(df, copy=False):
         """Clean string encoding issues in a DataFrame.
         
         Args:
             df: Input DataFrame
+            copy: Deep-copy the input first (by default only the columns that change are new)
             
         Returns:
             DataFrame: Cleaned DataFrame
         """
         logger.info("Cleaning string encoding in DataFrame")
         
-        # Make a copy to avoid modifying the original
-        cleaned_df = df.copy()
+        # Shallow copy: the original is never modified and unchanged columns are shared
+        cleaned_df = df.copy(deep=copy)
         
-        # Apply encoding fix to string columns
-        cleaned_df = cleaned_df.applymap(
-            lambda x: x.encode("unicode_escape").decode("utf-8") if isinstance(x, str) else x
-        )
+        # Apply encoding fix to string columns, once per distinct value
+        for col in cleaned_df.columns:
+            series = cleaned_df[col]
+            
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                cleaned_df[col] = series.cat.rename_categories(_escape_unicode)
+                continue
+                
+            if not pd.api.types.is_string_dtype(series.dtype):
+                continue
+                
+            codes, uniques = pd.factorize(series)
+            encoded = np.array([_escape_unicode(value) for value in uniques], dtype=object)
+            
+            # Missing values (code -1) are left untouched
+            values = series.to_numpy(dtype=object, copy=True)
+            present = codes >= 0
+            values[present] = encoded[codes[present]]
+            
+            if series.dtype == object:
+                cleaned_df[col] = values
+            else:
+                cleaned_df[col] = pd.array(values, dtype=series.dtype)
         
         return cleaned_df
     
     @staticmethod
-    def standardize_column_names(df, column_mapping=None):
+    def standardize_column_names(df, column_mapping=None, copy=False):
         """Standardize column names in a DataFrame.
         
         Args:
             df: Input DataFrame
             column_mapping: Dictionary of {old_name: new_name}
+            copy: Deep-copy the data (by default the new frame shares it)
             
         Returns:
             DataFrame: DataFrame with standardized column names
         """
         logger.info("Standardizing column names in DataFrame")
         
-        # Make a copy to avoid modifying the original
-        std_df = df.copy()
+        # Shallow copy: only the column labels change
+        std_df = df.copy(deep=copy)
         
         # Apply column mapping if provided
         if column_mapping:
-            std_df = std_df.rename(columns=column_mapping)
+            std_df = std_df.rename(columns=column_mapping, copy=False)
             
-        # Standardize remaining column names
-        std_df.columns = [
-            col.lower().replace(" ", "_") for col in std_df.columns
-        ]
+        # Standardize remaining column names (skipped when they already are)
+        std_columns = std_df.columns.str.lower().str.replace(" ", "_", regex=False)
+        if not std_columns.equals(std_df.columns):
+            std_df.columns = std_columns
         
         return std_df
     
     @staticmethod
-    def extract_date_features(df, date_column):
+    def categorize_columns(df, columns, max_ratio=0.5):
+        """Convert low-cardinality string columns to category dtype in place.
+        
+        Args:
+            df: Input DataFrame (modified in place)
+            columns: Names of candidate columns (missing ones are ignored)
+            max_ratio: Convert only when distinct values / rows is below this ratio
+            
+        Returns:
+            DataFrame: The same DataFrame, for chaining
+        """
+        row_count = len(df)
+        if row_count == 0:
+            return df
+            
+        for col in columns:
+            if col not in df.columns or not pd.api.types.is_string_dtype(df[col].dtype):
+                continue
+                
+            if df[col].nunique() / row_count < max_ratio:
+                df[col] = df[col].astype("category")
+                logger.debug(f"Converted column {col} to category dtype")
+        
+        return df
+    
+    @staticmethod
+    def extract_date_features(df, date_column, copy=False):
         """Extract date features from a date column.
         
         Args:
             df: Input DataFrame
             date_column: Name of the date column
+            copy: Deep-copy the input first (by default existing columns are shared)
             
         Returns:
             DataFrame: DataFrame with additional date features
         """
         logger.info(f"Extracting date features from column: {date_column}")
         
-        # Make a copy to avoid modifying the original
-        result_df = df.copy()
+        # Shallow copy: new columns are added without duplicating existing ones
+        result_df = df.copy(deep=copy)
         
-        # Convert column to datetime if not already
-        if not pd.api.types.is_datetime64_any_dtype(result_df[date_column]):
-            result_df[date_column] = pd.to_datetime(result_df[date_column])
+        # Convert column to datetime if not already (only once)
+        dates = result_df[date_column]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+            result_df[date_column] = dates
         
         # Extract date features
-        result_df[f"{date_column}_year"] = result_df[date_column].dt.year
-        result_df[f"{date_column}_month"] = result_df[date_column].dt.month
-        result_df[f"{date_column}_day"] = result_df[date_column].dt.day
-        result_df[f"{date_column}_quarter"] = result_df[date_column].dt.quarter
+        year, month, day, quarter = _date_parts(dates)
+        features = {
+            f"{date_column}_year": year,
+            f"{date_column}_month": month,
+            f"{date_column}_day": day,
+            f"{date_column}_quarter": quarter,
+        }
+        for name, values in features.items():
+            result_df[name] = values
         
         return result_df
     
@@ -102,14 +226,19 @@ class DataTransformer:
         """
         logger.info("Extracting forecast metadata")
         
-        # Get unique validity date
-        validity_date = pd.to_datetime(df[validity_date_column]).dt.date.unique()
+        # Get unique validity dates first, so only the distinct values get parsed
+        validity_dates = df[validity_date_column].drop_duplicates().dropna()
+        if not pd.api.types.is_datetime64_any_dtype(validity_dates.dtype):
+            validity_dates = pd.to_datetime(validity_dates)
+        validity_dates = validity_dates.dt.date.drop_duplicates()
         
-        if len(validity_date) == 0:
+        if len(validity_dates) == 0:
             raise ValueError(f"No validity dates found in column: {validity_date_column}")
+        if len(validity_dates) > 1:
+            raise ValueError(f"Multiple validity dates found in column: {validity_date_column}")
         
         # Convert to date object
-        validity_date_obj = validity_date.item()
+        validity_date_obj = validity_dates.iloc[0]
         
         # Create formatted string
         validity_date_str = validity_date_obj.strftime("%d_%b_%y").upper()
@@ -121,33 +250,40 @@ class DataTransformer:
         return validity_date_str, forecast_cycle
     
     @staticmethod
-    def filter_dataframe(df, filter_dict):
+    def filter_dataframe(df, filter_dict, copy=False):
         """Filter DataFrame based on conditions.
         
         Args:
             df: Input DataFrame
             filter_dict: Dictionary of {column: value} pairs to filter on
+            copy: Deep-copy the input when no filter applies
             
         Returns:
             DataFrame: Filtered DataFrame
         """
         logger.info(f"Filtering DataFrame with conditions: {filter_dict}")
         
-        # Make a copy to avoid modifying the original
-        filtered_df = df.copy()
-        
-        # Apply each filter condition
-        for column, value in filter_dict.items():
-            if column in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[column] == value]
+        columns = []
+        for column in filter_dict:
+            if column in df.columns:
+                columns.append(column)
             else:
                 logger.warning(f"Column not found for filtering: {column}")
         
+        if not columns:
+            return df.copy(deep=copy)
+        
+        # Accumulate one mask in place and index once (missing values never match)
+        mask = np.ones(len(df), dtype=bool)
+        for column in columns:
+            mask &= (df[column] == filter_dict[column]).to_numpy(dtype=bool, na_value=False)
+        filtered_df = df[mask]
+        
         logger.info(f"Filtering resulted in {filtered_df.shape[0]} rows")
         return filtered_df
     
     @staticmethod
-    def calculate_derived_metrics(df, source_col1, source_col2, result_col, operation="subtract"):
+    def calculate_derived_metrics(df, source_col1, source_col2, result_col, operation="subtract", copy=False):
         """Calculate derived metrics between columns.
         
         Args:
@@ -156,14 +292,15 @@ class DataTransformer:
             source_col2: Second source column
             result_col: Result column name
             operation: Operation to perform (subtract, add, multiply, divide)
+            copy: Deep-copy the input first (by default existing columns are shared)
             
         Returns:
             DataFrame: DataFrame with calculated metrics
         """
         logger.info(f"Calculating derived metric: {result_col} from {source_col1} and {source_col2}")
         
-        # Make a copy to avoid modifying the original
-        result_df = df.copy()
+        # Shallow copy: only the result column is new
+        result_df = df.copy(deep=copy)
         
         # Check if source columns exist
         if source_col1 not in result_df.columns or source_col2 not in result_df.columns:
@@ -174,17 +311,28 @@ class DataTransformer:
                 missing.append(source_col2)
             raise ValueError(f"Source columns not found: {', '.join(missing)}")
         
-        # Perform the calculation based on the operation
-        if operation == "subtract":
-            result_df[result_col] = result_df[source_col1] - result_df[source_col2]
-        elif operation == "add":
-            result_df[result_col] = result_df[source_col1] + result_df[source_col2]
-        elif operation == "multiply":
-            result_df[result_col] = result_df[source_col1] * result_df[source_col2]
-        elif operation == "divide":
-            # Avoid division by zero
-            result_df[result_col] = result_df[source_col1] / result_df[source_col2].replace(0, float('nan'))
-        else:
+        if operation not in _OPERATIONS:
             raise ValueError(f"Unsupported operation: {operation}")
         
+        values1 = _numeric_values(result_df[source_col1])
+        values2 = _numeric_values(result_df[source_col2])
+        
+        if values1 is None or values2 is None:
+            # Dates, durations etc. keep the pandas semantics (e.g. date - date is a Timedelta)
+            series1 = result_df[source_col1]
+            series2 = result_df[source_col2]
+            if operation == "divide":
+                # Avoid division by zero
+                series2 = series2.replace(0, float('nan'))
+            
+            result_df[result_col] = _SERIES_OPERATIONS[operation](series1, series2)
+            return result_df
+        
+        # Perform the calculation on the raw arrays (both columns share the same index)
+        if operation == "divide":
+            # Avoid division by zero
+            values2 = np.where(values2 == 0, np.nan, values2)
+        
+        result_df[result_col] = _OPERATIONS[operation](values1, values2)
+        
         return result_df
@@ -1,22 +1,28 @@
 """Download BOM EO Forecast data and export to Excel/Parquet."""
 
 import logging
+import logging.handlers
+import multiprocessing
 import os
 import time
-import webbrowser
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 
-import dask.dataframe as da
 import pandas as pd
-from dateutil import relativedelta
 
 from ..config.config import config
 from ..database.connection import OracleConnection
+from ..operations.load import DataLoader
+from ..operations.transform import DataTransformer
 from ..utils.credentials import credential_manager
+from ..utils.logging_config import setup_worker_logging
 
 logger = logging.getLogger(__name__)
 
+# Heavily repeated string columns held as category dtype
+CATEGORY_COLUMNS = ["DP_GROUP_MKT", "KEY_FIGURE", "TIMEZONE", "PRODUCT_DESCRIPTION", "LOCATION_ID"]
+
 
 def get_forecast_data():
     """Retrieve BOM EO Forecast data from Oracle database.
@@ -39,12 +45,13 @@ def get_forecast_data():
     logger.info("Processing retrieved data")
     
     # Remove encoding errors
-    df = df.applymap(lambda x: x.encode("unicode_escape").decode("utf-8") if isinstance(x, str) else x)
+    df = DataTransformer.clean_encoding(df)
+    
+    # Store repeated strings once per distinct value
+    DataTransformer.categorize_columns(df, CATEGORY_COLUMNS)
     
     # Get validity_date and forecast_cycle variables
-    validity_date = pd.to_datetime(df["VALIDITY_DATE"]).dt.date.unique()
-    forecast_cycle = (validity_date.item() + relativedelta.relativedelta(months=1, day=1)).strftime("%B")
-    validity_date_str = validity_date.item().strftime("%d_%b_%y").upper()
+    validity_date_str, forecast_cycle = DataTransformer.get_forecast_metadata(df, "VALIDITY_DATE")
     
     return df, validity_date_str, forecast_cycle
 
@@ -57,7 +64,7 @@ def create_output_folders(validity_date, forecast_cycle):
         forecast_cycle: Forecast cycle name
         
     Returns:
-        tuple: (main_folder, sub_folder)
+        tuple: (main_path, sub_path), both already created
     """
     logger.info("Creating output folders")
     
@@ -65,75 +72,101 @@ def create_output_folders(validity_date, forecast_cycle):
     main_folder = f"BOM EO Forecast Snapshot on {validity_date} for {forecast_cycle} Forecast Cycle"
     sub_folder = f"BOM EO Forecast Parquet"
     
-    # Create folders
+    # Create folders (one call creates both)
     main_path = Path(main_folder)
     sub_path = main_path / sub_folder
     
-    if not main_path.exists():
-        main_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created folder: {main_path}")
-        
-        sub_path.mkdir(parents=True, exist_ok=True)
+    try:
+        sub_path.mkdir(parents=True)
         logger.info(f"Created folder: {sub_path}")
+    except FileExistsError:
+        pass
     
-    return main_folder, sub_folder
+    return main_path, sub_path
 
 
-def export_to_excel(df, validity_date, main_folder):
+def _write_market_excel(args):
+    """Write one market's data to its Excel file (runs in a worker process).
+    
+    Args:
+        args: Tuple of (market, market_df, validity_date, main_path)
+        
+    Returns:
+        tuple: (market, row_count, output_file)
+    """
+    market, market_df, validity_date, main_path = args
+    output_file = main_path / f"BOM_EO_Forecast_{validity_date}_{market}.xlsx"
+    DataLoader.load_to_excel(market_df, output_file, sheet_name="DATA", index=False)
+    
+    return market, market_df.shape[0], output_file
+
+
+def export_to_excel(df, validity_date, main_path, max_workers=None):
     """Export data to Excel files by market.
     
+    Market files are independent, so they are written in parallel worker
+    processes. Workers are spawned rather than forked (the parent runs
+    logging threads) and send their log records back to the parent.
+    
     Args:
         df: DataFrame with forecast data
         validity_date: Validity date string
-        main_folder: Output folder path
+        main_path: Output folder (Path, already created)
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
     """
     logger.info("Exporting data to Excel files by market")
     
-    # Get all markets
-    markets = df["DP_GROUP_MKT"].unique()
-    markets = [x for x in markets if not pd.isnull(x)]
-    markets.sort()
+    # Categorical keys make the groupby a cheap integer-code pass
+    if not isinstance(df["DP_GROUP_MKT"].dtype, pd.CategoricalDtype):
+        df["DP_GROUP_MKT"] = df["DP_GROUP_MKT"].astype("category")
     
-    # Create folder if it doesn't exist
-    main_path = Path(main_folder)
-    main_path.mkdir(parents=True, exist_ok=True)
+    # Split the data by market in a single pass (rows without a market are dropped)
+    tasks = [
+        (market, market_df, validity_date, main_path)
+        for market, market_df in df.groupby("DP_GROUP_MKT", sort=True, observed=True)
+    ]
+    
+    # Forward worker log records to this process's handlers
+    root_logger = logging.getLogger()
+    mp_context = multiprocessing.get_context("spawn")
+    log_queue = mp_context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *root_logger.handlers)
+    listener.start()
     
     # Export data for each market
-    for market in markets:
-        market_df = df[df["DP_GROUP_MKT"] == market]
-        row_count = market_df.shape[0]
-        
-        output_file = main_path / f"BOM_EO_Forecast_{validity_date}_{market}.xlsx"
-        market_df.to_excel(output_file, sheet_name="DATA", index=False)
-        
-        logger.info(f"Exported {row_count} rows for market {market} to {output_file}")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=setup_worker_logging,
+            initargs=(log_queue, root_logger.getEffectiveLevel())
+        ) as executor:
+            for market, row_count, output_file in executor.map(_write_market_excel, tasks):
+                logger.info(f"Exported {row_count} rows for market {market} to {output_file}")
+    finally:
+        listener.stop()
 
 
-def export_to_parquet(df, validity_date, main_folder, sub_folder):
+def export_to_parquet(df, validity_date, output_path):
     """Export data to Parquet files.
     
     Args:
         df: DataFrame with forecast data
         validity_date: Validity date string
-        main_folder: Output folder path
-        sub_folder: Parquet subfolder path
+        output_path: Parquet output folder (Path, already created)
     """
     logger.info("Exporting data to Parquet files")
     
-    # Create path
-    output_path = Path(main_folder) / sub_folder
-    output_path.mkdir(parents=True, exist_ok=True)
-    
     # Define name function
     name_function = lambda x: f"BOM_EO_Forecast_{validity_date}-{x}.parquet"
     
-    # Convert to dask DataFrame and export to parquet
-    ddf = da.from_pandas(df, chunksize=5000000)
-    ddf.to_parquet(
+    # Export to parquet, 5M rows per file
+    DataLoader.load_to_parquet(
+        df,
         str(output_path),
         name_function=name_function,
-        engine="auto", 
-        compression="snappy"
+        compression="snappy",
+        chunksize=5000000
     )
     
     logger.info(f"Exported data to Parquet files in {output_path}")
@@ -167,17 +200,17 @@ Forecast Cycle and create Excel files in the folder for each Submarket.
         df, validity_date, forecast_cycle = get_forecast_data()
         
         # Create output folders
-        main_folder, sub_folder = create_output_folders(validity_date, forecast_cycle)
+        main_path, sub_path = create_output_folders(validity_date, forecast_cycle)
         
         # Export to Excel if requested
         if generate_excel:
-            export_to_excel(df, validity_date, main_folder)
+            export_to_excel(df, validity_date, main_path)
         else:
             logger.info("Skipping Excel export as requested")
         
         # Export to Parquet if requested
         if generate_parquet:
-            export_to_parquet(df, validity_date, main_folder, sub_folder)
+            export_to_parquet(df, validity_date, sub_path)
         else:
             logger.info("Skipping Parquet export as requested")
         
@@ -193,13 +226,15 @@ Forecast Cycle and create Excel files in the folder for each Submarket.
             if drive_url:
                 logger.info("Opening Google Drive in browser")
                 print("For the final step, upload the BOM EO Forecast Snapshot folder to Google Drive.")
+                
+                import webbrowser
                 webbrowser.open(drive_url)
             else:
                 logger.warning("Google Drive URL not configured")
                 print("For the final step, upload the BOM EO Forecast Snapshot folder to Google Drive.")
         
         # Success message
-        print(f"\nSuccess! Files have been created in folder: {main_folder}")
+        print(f"\nSuccess! Files have been created in folder: {main_path}")
         
     except Exception as e:
         logger.exception("Error in download_forecast")
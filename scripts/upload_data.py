@@ -1,37 +1,57 @@
 """Upload data from file to Oracle database."""
 
 import logging
-import os
 import traceback
-from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-from sqlalchemy import MetaData, Table
 
 from ..config.config import config
 from ..database.connection import OracleConnection
+from ..operations.extract import KNOWN_SCHEMAS, DataExtractor
+from ..operations.load import DataLoader
+from ..operations.transform import DataTransformer
 from ..utils.credentials import credential_manager
 
 logger = logging.getLogger(__name__)
 
+# Extensions of files offered for upload
+UPLOAD_FILE_EXTENSIONS = (".csv", ".tsv", ".txt")
+
+# Rows read and inserted per chunk
+UPLOAD_CHUNK_SIZE = 200000
+
+# File column names mapped to table column names
+RENAMED_COLUMNS = {
+    "Validity_Date":        "validity_date",
+    "Timezone":             "timezone",
+    "Part_ID":              "part_id",
+    "Product_ID":           "product_id",
+    "Product_Description":  "product_description",
+    "Last_Submitted_Date":  "last_submitted_date",
+    "Location_ID":          "location_id",
+    "Key_Figure":           "key_figure",
+    "Planned_Month":        "planned_month",
+    "FINAL_CON_DEM":        "qty"
+}
+
+# Table column order
+UPLOAD_COLUMNS = list(RENAMED_COLUMNS.values())
+
+# Layout of the Validity_Date values in upload files
+VALIDITY_DATE_FORMAT = "%Y.%m.%d %H:%M:%S"
+
+# Heavily repeated string columns held as category dtype
+CATEGORY_COLUMNS = ["key_figure", "timezone", "product_description", "location_id"]
+
 
 def list_files():
-    """List files in the current directory.
+    """List candidate data files in the current directory.
     
     Returns:
         dict: Dictionary of {index: filename}
     """
-    # Get all files in current directory
-    files = {}
-    i = 1
-    
-    for file in sorted(os.listdir('.')):
-        if os.path.isfile(file):
-            files[i] = file
-            i += 1
-    
-    return files
+    return DataExtractor.list_files_in_directory('.', extensions=UPLOAD_FILE_EXTENSIONS)
 
 
 def prompt_for_file_selection():
@@ -41,9 +61,11 @@ def prompt_for_file_selection():
         str: Selected filename
     """
     files = list_files()
+    if not files:
+        raise ValueError(f"No data files ({', '.join(UPLOAD_FILE_EXTENSIONS)}) found in the current directory")
     
     # Show list of files
-    print("\nHere is a list of files in the current directory:")
+    print("\nHere is a list of data files in the current directory:")
     for no, file in files.items():
         print(f"{no}. {file}")
     
@@ -61,105 +83,101 @@ def prompt_for_file_selection():
             print("Please enter a number.")
 
 
-def load_file_to_dataframe(filename):
-    """Load file data into a DataFrame.
+def load_file_to_dataframe(filename, tablename="t_ibp_cons_rdc", chunksize=UPLOAD_CHUNK_SIZE):
+    """Load file data into DataFrame chunks.
     
     Args:
         filename: Path to file
+        tablename: Target table name (selects the known file schema, if any)
+        chunksize: Number of rows per chunk
         
-    Returns:
-        DataFrame: Loaded data
+    Yields:
+        DataFrame: Chunk of loaded data
     """
     logger.info(f"Loading data from file: {filename}")
     
     try:
-        # Load the file
-        df = pd.read_csv(filename, sep="\t")
-        
-        # Rename columns
-        renamed_columns = {
-            "Validity_Date":        "validity_date",
-            "Timezone":             "timezone",
-            "Part_ID":              "part_id",
-            "Product_ID":           "product_id",
-            "Product_Description":  "product_description",
-            "Last_Submitted_Date":  "last_submitted_date",
-            "Location_ID":          "location_id",
-            "Key_Figure":           "key_figure",
-            "Planned_Month":        "planned_month",
-            "FINAL_CON_DEM":        "qty"
-        }
-        df = df.rename(columns=renamed_columns)
-        
-        # Reorder columns
-        df = df[[
-            'validity_date',
-            'timezone',
-            'part_id',
-            'product_id',
-            'product_description',
-            'last_submitted_date',
-            'location_id',
-            'key_figure',
-            'planned_month',
-            'qty'
-        ]]
+        # Stream the file, with declared dtypes when the layout is known
+        known_schema = tablename if tablename in KNOWN_SCHEMAS else None
+        chunks = DataExtractor.iter_tab_delimited(
+            filename,
+            chunksize=chunksize,
+            known_schema=known_schema,
+            usecols=list(RENAMED_COLUMNS)
+        )
+        
+        total_rows = 0
+        for df in chunks:
+            # Rename columns in place, then reorder only if the file's order differs
+            df.columns = [RENAMED_COLUMNS[col] for col in df.columns]
+            if df.columns.tolist() != UPLOAD_COLUMNS:
+                df = df[UPLOAD_COLUMNS]
+            
+            # Parse the validity date with its known format (each distinct value is parsed once)
+            df["validity_date"] = pd.to_datetime(df["validity_date"], format=VALIDITY_DATE_FORMAT)
+            
+            # Store repeated strings once per distinct value
+            DataTransformer.categorize_columns(df, CATEGORY_COLUMNS)
+            
+            total_rows += df.shape[0]
+            yield df
         
-        logger.info(f"Loaded {df.shape[0]} rows from {filename}")
-        return df
+        logger.info(f"Loaded {total_rows} rows from {filename}")
         
     except Exception as e:
         logger.exception(f"Error loading file: {filename}")
         raise ValueError(f"Failed to load file: {str(e)}")
 
 
-def upload_to_database(engine, df, tablename):
-    """Upload DataFrame to database table.
+def get_file_validity_date(filename):
+    """Read the validity date from the first data row of a file.
+    
+    Args:
+        filename: Path to file
+        
+    Returns:
+        Timestamp: Validity date of the file
+    """
+    first_row = pd.read_csv(filename, sep="\t", nrows=1, usecols=["Validity_Date"], dtype=str)
+    if first_row.empty:
+        raise ValueError(f"No data rows in file: {filename}")
+    
+    return pd.to_datetime(first_row["Validity_Date"].iloc[0], format=VALIDITY_DATE_FORMAT)
+
+
+def get_max_table_date(engine, tablename):
+    """Get the latest validity date already loaded into a table.
     
     Args:
         engine: SQLAlchemy engine
-        df: DataFrame to upload
+        tablename: Table name
+        
+    Returns:
+        Timestamp: Latest validity date (None if the table is empty)
+    """
+    query = f"SELECT MAX(validity_date) as max_date FROM {tablename}"
+    result = pd.read_sql(query, engine)
+    max_table_date = result["max_date"].iloc[0]
+    
+    return None if pd.isnull(max_table_date) else pd.to_datetime(max_table_date)
+
+
+def upload_to_database(engine, data, tablename):
+    """Upload data to database table.
+    
+    Args:
+        engine: SQLAlchemy engine
+        data: DataFrame, or iterable of DataFrame chunks, to upload
         tablename: Target table name
     """
     logger.info(f"Uploading data to table: {tablename}")
     
     try:
-        # Check if the data is already in the table
-        # Get validity_date from the file
-        file_date_str = df["validity_date"].iloc[0]
-        file_date = datetime.strptime(file_date_str, "%Y.%m.%d %H:%M:%S")
-        
-        # Get max date from the table
-        query = f"SELECT MAX(validity_date) as max_date FROM {tablename}"
-        result = pd.read_sql(query, engine)
-        max_table_date = result["max_date"].iloc[0]
-        
-        if max_table_date is not None:
-            max_table_date = pd.to_datetime(max_table_date)
-            
-            if file_date <= max_table_date:
-                logger.info("Data already exists in the table (same or older date)")
-                print("Data is already updated in the table.")
-                return
-        
-        # Create metadata and table reference
-        metadata = MetaData()
-        metadata.reflect(bind=engine, only=[tablename])
-        
-        if tablename not in metadata.tables:
-            raise ValueError(f"Table {tablename} does not exist in the database")
-            
-        table = metadata.tables[tablename]
+        # Insert all chunks in a single transaction through the driver's array interface
+        total_rows = DataLoader.bulk_insert_to_database(data, engine, tablename)
         
-        # Convert DataFrame to records
-        records = df.to_dict(orient='records')
-        
-        # Insert data
-        with engine.begin() as connection:
-            connection.execute(table.insert(), records)
-            
-        logger.info(f"Successfully inserted {len(records)} records into {tablename}")
-        print(f"Successfully inserted {len(records)} records into {tablename}")
+        logger.info(f"Successfully inserted {total_rows} records into {tablename}")
+        print(f"Successfully inserted {total_rows} records into {tablename}")
         
     except Exception as e:
         logger.exception(f"Error uploading to table: {tablename}")
@@ -189,15 +207,22 @@ This script will upload data from a file to the specified Oracle database table.
             
         print(f"\nSelected file: {filename}")
         
-        # Load data from file
-        df = load_file_to_dataframe(filename)
+        # Get validity_date from the file (first row only)
+        file_date = get_file_validity_date(filename)
         
         # Create database connection
         with OracleConnection() as db_conn:
             engine = db_conn.create_sqlalchemy_engine()
             
-            # Upload to database
-            upload_to_database(engine, df, tablename)
+            # Check if the data is already in the table before reading the file
+            max_table_date = get_max_table_date(engine, tablename)
+            if max_table_date is not None and file_date <= max_table_date:
+                logger.info("Data already exists in the table (same or older date)")
+                print("Data is already updated in the table.")
+            else:
+                # Stream data from file and upload to database
+                chunks = load_file_to_dataframe(filename, tablename)
+                upload_to_database(engine, chunks, tablename)
             
         print("\nOperation completed successfully!")
         
@@ -9,11 +9,13 @@ setup(
     include_package_data=True,
     install_requires=[
         "cx_Oracle>=8.3.0",
-        "dask>=2023.3.0",
+        "keyring>=23.0.0",
         "numpy>=1.23.0",
         "pandas>=1.5.0",
+        "pyarrow>=10.0.0",
         "PyYAML>=6.0",
         "sqlalchemy>=1.4.0",
+        "XlsxWriter>=3.0.0",
     ],
     entry_points={
         "console_scripts": [
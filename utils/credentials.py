@@ -1,14 +1,83 @@
 """Credential management utilities."""
 
+import functools
 import json
+import logging
 import os
 from pathlib import Path
 
 from ..config.config import config
 
+logger = logging.getLogger(__name__)
+
+# Passwords go to the OS secret store when keyring is installed and has a usable backend
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+# Service name for passwords stored in the OS keyring
+KEYRING_SERVICE = "oracle_etl"
+
+
+@functools.lru_cache(maxsize=None)
+def _keyring_usable():
+    """Check (once per process) whether keyring has a backend that stores passwords."""
+    if keyring is None:
+        logger.debug("keyring is not installed, passwords are kept in the credentials file")
+        return False
+    try:
+        backend = keyring.get_keyring()
+    except Exception as e:
+        logger.debug(f"No OS keyring backend, passwords are kept in the credentials file: {e}")
+        return False
+        
+    # The fail backend (and an empty chainer) have a priority of 0 or lower
+    if backend.priority <= 0:
+        logger.debug(f"No usable OS keyring backend ({backend}), passwords are kept in the credentials file")
+        return False
+    return True
+
+
+def _keyring_get(username):
+    """Get a password from the OS keyring (None if unavailable or not stored)."""
+    if not _keyring_usable():
+        return None
+    try:
+        return keyring.get_password(KEYRING_SERVICE, username)
+    except Exception as e:
+        logger.warning(f"Could not read password from the OS keyring: {e}")
+        return None
+
+
+def _keyring_set(username, password):
+    """Store a password in the OS keyring; returns False if that is not possible."""
+    if not _keyring_usable():
+        return False
+    try:
+        keyring.set_password(KEYRING_SERVICE, username, password)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not store password in the OS keyring, using the credentials file: {e}")
+        return False
+
+
+def _keyring_delete(username):
+    """Remove a password from the OS keyring, if present."""
+    if not _keyring_usable():
+        return
+    try:
+        keyring.delete_password(KEYRING_SERVICE, username)
+    except Exception:
+        pass
+
 
 class CredentialManager:
-    """Manage database credentials."""
+    """Manage database credentials.
+    
+    The username is kept in the credentials file and the password in the OS
+    keyring. Without a usable keyring the password stays in the file.
+    """
     
     def __init__(self, credentials_file=None):
         """Initialize credential manager.
@@ -18,6 +87,9 @@ class CredentialManager:
         """
         self.credentials_file = credentials_file or config.get('app', 'credentials_file')
         
+        # (file mtime, (username, password)) of the last read or write
+        self._cache = None
+        
     def credentials_exist(self):
         """Check if credentials file exists."""
         return os.path.exists(self.credentials_file)
@@ -29,26 +101,82 @@ class CredentialManager:
             username: Database username
             password: Database password
         """
-        credentials = {
-            "username": username.strip().lower(),
-            "password": password.strip()
-        }
+        username = username.strip().lower()
+        password = password.strip()
+        
+        self._write_file(username, password, in_keyring=_keyring_set(username, password))
+        
+    def _write_file(self, username, password, in_keyring):
+        """Write the credentials file, leaving the password out if it is in the keyring."""
+        credentials = {"username": username}
+        if not in_keyring:
+            credentials["password"] = password
         
         with open(self.credentials_file, 'w') as f:
             json.dump(credentials, f)
             
+        self._cache = (
+            os.stat(self.credentials_file).st_mtime_ns,
+            (username, password)
+        )
+            
     def load_credentials(self):
         """Load credentials from file.
         
+        The file is only re-read when its modification time changes.
+        
         Returns:
             tuple: (username, password)
         """
-        if not self.credentials_exist():
+        try:
+            mtime = os.stat(self.credentials_file).st_mtime_ns
+        except FileNotFoundError:
+            self._cache = None
             return None, None
             
+        if self._cache is not None and self._cache[0] == mtime:
+            return self._cache[1]
+            
         with open(self.credentials_file, 'r') as f:
             data = json.load(f)
-            return data.get('username'), data.get('password')
+            
+        username, password = data.get('username'), data.get('password')
+        
+        if password is None:
+            password = _keyring_get(username) if username else None
+        elif username and _keyring_set(username, password):
+            # Drop the plaintext password from an older credentials file now that
+            # the keyring holds it (without a usable keyring the file is left alone)
+            logger.info("Moved the stored password into the OS keyring")
+            self._write_file(username, password, in_keyring=True)
+            return self._cache[1]
+            
+        credentials = (username, password)
+        self._cache = (mtime, credentials)
+        return credentials
+    
+    def reset_credentials(self):
+        """Delete the stored credentials (file and keyring entry).
+        
+        Returns:
+            bool: Whether a credentials file was found and deleted
+        """
+        self._cache = None
+        
+        if not os.path.exists(self.credentials_file):
+            return False
+            
+        # A corrupt file is still removed, there is just no keyring entry to find
+        try:
+            with open(self.credentials_file, 'r') as f:
+                username = json.load(f).get('username')
+        except (OSError, ValueError, AttributeError):
+            username = None
+            
+        if username:
+            _keyring_delete(username)
+        os.remove(self.credentials_file)
+        return True
             
     def prompt_for_credentials(self, prompt_text=None):
         """Prompt user for credentials interactively.
@@ -66,7 +194,7 @@ class CredentialManager:
 Oracle SQL Credentials are required to run this tool. The credentials
 are the same Username and Password required to access the Oracle Database.
 
-NOTE: To reset credentials, delete the credentials.json file in the current folder.
+NOTE: To reset credentials, run the tool with --reset-credentials.
 """)
         
         username = input("Username: ").strip().lower()
@@ -89,7 +217,12 @@ NOTE: To reset credentials, delete the credentials.json file in the current fold
         if force_prompt or not self.credentials_exist():
             return self.prompt_for_credentials()
         
-        return self.load_credentials()
+        username, password = self.load_credentials()
+        if not username or not password:
+            # e.g. the keyring entry was removed outside the tool
+            return self.prompt_for_credentials()
+            
+        return username, password
 
 # Create instance for easy import
 credential_manager = CredentialManager()
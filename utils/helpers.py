@@ -1,44 +1,159 @@
 """Helper functions for the ETL tool."""
 
+import functools
 import logging
 import os
+import stat
+import sys
+import threading
 import time
-import webbrowser
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Default formats for get_timestamp_str / get_precise_timestamp_str
+DEFAULT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+DEFAULT_PRECISE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S_%f"
+
+# Absolute paths of directories created by create_directory_if_not_exists
+_created_dirs = set()
+_created_dirs_lock = threading.Lock()
+
+# Units used by format_file_size / format_file_sizes
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Smallest size shown in each unit above bytes (1 KB, 1 MB, ...)
+_UNIT_THRESHOLDS = 1024.0 ** np.arange(1, len(_UNITS))
+
+
+def _get_path_opener():
+    """Pick the platform's way of opening a folder in the file explorer."""
+    if os.name == 'nt':  # Windows
+        return os.startfile
+    
+    command = 'open' if sys.platform == 'darwin' else 'xdg-open'  # macOS / Linux
+    
+    def open_path(path):
+        # Imported on first use; most runs never open an explorer window
+        import subprocess
+        subprocess.call([command, path])
+    
+    return open_path
+
+
+# Platform file explorer opener, detected once at import
+_OPEN_PATH = _get_path_opener()
+
 
 def measure_execution_time(func):
     """Decorator to measure function execution time.
     
+    If logging is already configured with INFO disabled, the function is
+    returned undecorated. Otherwise the wrapper only times calls while
+    INFO is enabled.
+    
     Args:
         func: Function to measure
         
     Returns:
         Wrapped function
     """
+    if logging.getLogger().handlers and not logger.isEnabledFor(logging.INFO):
+        return func
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        logger.info(f"Starting {func.__name__}")
+        if not logger.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        
+        logger.debug("Starting %s", func.__name__)
+        start_time = time.perf_counter_ns()
         
         result = func(*args, **kwargs)
         
-        end_time = time.time()
-        execution_time = end_time - start_time
-        logger.info(f"Completed {func.__name__} in {execution_time:.3f} seconds")
+        execution_time = (time.perf_counter_ns() - start_time) / 1e9
+        logger.info("Completed %s in %.3f seconds", func.__name__, execution_time)
         
         return result
     
     return wrapper
 
 
-def get_timestamp_str(format_str="%Y%m%d_%H%M%S"):
+class BatchLogger:
+    """Collect high-frequency log messages and emit them as one record.
+    
+    Meant for per-row or per-chunk progress messages inside ETL loops:
+    every `every` messages are joined into a single record, so the
+    formatting, locking and I/O are paid once per batch. Use it as a
+    context manager so the last partial batch is flushed.
+    
+    Example:
+        with BatchLogger(logger, every=1000) as batch_logger:
+            for row in rows:
+                batch_logger.info("Processed %s", row.id)
+    """
+    
+    def __init__(self, target_logger, every=1000, level=logging.INFO):
+        """Initialize batch logger.
+        
+        Args:
+            target_logger: Logger that receives the batched records
+            every: Number of messages per emitted record
+            level: Level of the emitted records
+        """
+        self.logger = target_logger
+        self.every = every
+        self.level = level
+        self._buffer = []
+    
+    def info(self, msg, *args):
+        """Add a message (formatted with %-style args when the batch is emitted)."""
+        if not self.logger.isEnabledFor(self.level):
+            return
+        
+        self._buffer.append((msg, args))
+        if len(self._buffer) >= self.every:
+            self.flush()
+    
+    def flush(self):
+        """Emit the collected messages as a single record."""
+        if not self._buffer:
+            return
+        
+        messages = "\n".join(msg % args if args else msg for msg, args in self._buffer)
+        self._buffer.clear()
+        self.logger.log(self.level, "%s", messages)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.flush()
+
+
+def get_timestamp_str(format_str=DEFAULT_TIMESTAMP_FORMAT):
     """Get a formatted timestamp string.
     
     Args:
-        format_str: Timestamp format
+        format_str: Timestamp format (time.strftime codes; use
+            get_precise_timestamp_str for %f)
+        
+    Returns:
+        str: Formatted timestamp
+    """
+    return time.strftime(format_str)
+
+
+def get_precise_timestamp_str(format_str=DEFAULT_PRECISE_TIMESTAMP_FORMAT):
+    """Get a formatted timestamp string with sub-second precision.
+    
+    Args:
+        format_str: Timestamp format (datetime.strftime codes, including %f)
         
     Returns:
         str: Formatted timestamp
@@ -46,18 +161,27 @@ def get_timestamp_str(format_str="%Y%m%d_%H%M%S"):
     return datetime.now().strftime(format_str)
 
 
-def create_directory_if_not_exists(directory_path):
+def create_directory_if_not_exists(directory_path, as_path=True):
     """Create directory if it doesn't exist.
     
+    Directories are remembered once created, so repeated calls for the
+    same directory are free.
+    
     Args:
         directory_path: Path to directory
+        as_path: Return a Path object (False returns directory_path unchanged)
         
     Returns:
-        Path: Path to directory
+        Path: Path to directory (directory_path itself if as_path is False)
     """
-    path = Path(directory_path)
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    # Skip the filesystem entirely for directories this process already created
+    key = os.path.abspath(directory_path)
+    if key not in _created_dirs:
+        os.makedirs(directory_path, exist_ok=True)
+        with _created_dirs_lock:
+            _created_dirs.add(key)
+    
+    return Path(directory_path) if as_path else directory_path
 
 
 def open_file_explorer(path):
@@ -68,21 +192,20 @@ def open_file_explorer(path):
     """
     path = os.path.normpath(path)
     
-    if os.path.isdir(path):
+    # A single stat answers both "exists" and "is a directory"
+    try:
+        is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        is_dir = False
+    
+    if is_dir:
         try:
-            if os.name == 'nt':  # Windows
-                os.startfile(path)
-            elif os.name == 'posix':  # macOS and Linux
-                import subprocess
-                if 'darwin' in os.uname().sysname.lower():  # macOS
-                    subprocess.call(['open', path])
-                else:  # Linux
-                    subprocess.call(['xdg-open', path])
-            logger.info(f"Opened file explorer to: {path}")
+            _OPEN_PATH(path)
+            logger.info("Opened file explorer to: %s", path)
         except Exception as e:
-            logger.warning(f"Failed to open file explorer: {e}")
+            logger.warning("Failed to open file explorer: %s", e)
     else:
-        logger.warning(f"Path does not exist: {path}")
+        logger.warning("Path does not exist: %s", path)
 
 
 def open_browser(url):
@@ -99,11 +222,13 @@ def open_browser(url):
         return False
     
     try:
+        # Imported on first use; most runs never open a browser
+        import webbrowser
         webbrowser.open(url)
-        logger.info(f"Opened browser to: {url}")
+        logger.info("Opened browser to: %s", url)
         return True
     except Exception as e:
-        logger.warning(f"Failed to open browser: {e}")
+        logger.warning("Failed to open browser: %s", e)
         return False
 
 
@@ -116,16 +241,143 @@ def format_file_size(size_bytes):
     Returns:
         str: Formatted size
     """
-    if size_bytes == 0:
+    if not size_bytes:
         return "0 B"
     
-    size_names = ("B", "KB", "MB", "GB", "TB", "PB")
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024
-        i += 1
+    # Each unit is 2**10 times the previous one, so the bit length picks the unit
+    i = min(max((int(abs(size_bytes)).bit_length() - 1) // 10, 0), len(_UNITS) - 1)
     
-    return f"{size_bytes:.2f} {size_names[i]}"
+    return f"{size_bytes / (1 << (i * 10)):.2f} {_UNITS[i]}"
+
+
+def _size_unit_indices_py(sizes):
+    """Unit index for each size in a float64 array (same rule as format_file_size)."""
+    return np.searchsorted(_UNIT_THRESHOLDS, np.abs(sizes), side="right")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_size_unit_kernel():
+    """Compile the unit index kernel with Numba if installed (imported on first use)."""
+    try:
+        from numba import njit
+    except ImportError:
+        return _size_unit_indices_py
+    return njit(cache=True)(_size_unit_indices_py)
+
+
+def _size_unit_indices(sizes):
+    """Unit index for each size in a float64 array, using the compiled kernel when available."""
+    return _get_size_unit_kernel()(sizes)
+
+
+def format_file_sizes(sizes):
+    """Format many file sizes in human-readable format.
+    
+    The unit for every size is picked in one compiled (Numba) or vectorized
+    (NumPy) pass; only the final string formatting runs per size.
+    
+    Args:
+        sizes: Sequence or array of sizes in bytes
+        
+    Returns:
+        list: Formatted sizes, as format_file_size would return them
+    """
+    sizes = np.asarray(sizes, dtype=np.float64).ravel()
+    indices = _size_unit_indices(sizes)
+    scaled = sizes / (1024.0 ** indices)
+    
+    return [
+        f"{value:.2f} {_UNITS[i]}" if size else "0 B"
+        for size, value, i in zip(sizes.tolist(), scaled.tolist(), indices.tolist())
+    ]
+
+
+def _iter_entries(directory, include_files, include_dirs, recursive):
+    """Yield the os.DirEntry objects behind iter_directory_contents."""
+    if recursive:
+        # Iterative scandir walk: DirEntry.path is reused instead of os.path.join
+        # and the type checks come from the directory read. Like os.walk,
+        # symlinked directories are listed but not descended into, and
+        # unreadable subdirectories are skipped.
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = os.scandir(current)
+            except OSError:
+                if current is directory:
+                    raise
+                continue
+            
+            with entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        if include_dirs:
+                            yield entry
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif include_files:
+                        yield entry
+    else:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if (entry.is_file() and include_files) or (entry.is_dir() and include_dirs):
+                    yield entry
+
+
+def iter_directory_contents(directory=".", include_files=True, include_dirs=True, recursive=False):
+    """Iterate over the contents of a directory.
+    
+    Paths are yielded as they are read, so only the directories still to be
+    visited are held in memory.
+    
+    Args:
+        directory: Directory path
+        include_files: Whether to include files
+        include_dirs: Whether to include directories
+        recursive: Whether to include subdirectories recursively
+        
+    Yields:
+        str: Path of each directory entry
+    """
+    try:
+        for entry in _iter_entries(directory, include_files, include_dirs, recursive):
+            yield entry.path
+            
+    except Exception as e:
+        logger.warning("Failed to list directory contents: %s", e)
+
+
+def iter_paths_with_sizes(directory=".", recursive=False):
+    """Iterate over the files in a directory together with their sizes.
+    
+    Sizes come from the scandir entries (no separate os.path.getsize call);
+    symlinks report their own size rather than their target's. Files that
+    cannot be stat'ed (e.g. removed while listing) are skipped.
+    
+    Args:
+        directory: Directory path
+        recursive: Whether to include subdirectories recursively
+        
+    Yields:
+        tuple: (path, size in bytes) for each file
+    """
+    try:
+        for entry in _iter_entries(directory, True, False, recursive):
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError as e:
+                logger.debug("Skipping %s: %s", entry.path, e)
+                continue
+            yield entry.path, size
+            
+    except Exception as e:
+        logger.warning("Failed to list directory contents: %s", e)
 
 
 def list_directory_contents(directory=".", include_files=True, include_dirs=True, recursive=False):
@@ -138,23 +390,6 @@ def list_directory_contents(directory=".", include_files=True, include_dirs=True
         recursive: Whether to include subdirectories recursively
         
     Returns:
-        list: Directory contents
+        list: Directory contents (see iter_directory_contents to stream them)
     """
-    contents = []
-    
-    try:
-        if recursive:
-            for root, dirs, files in os.walk(directory):
-                if include_dirs:
-                    for dir_name in dirs:
-                        dir_path = os.path.join(root, dir_name)
-                        contents.append(dir_path)
-                
-                if include_files:
-                    for file_name in files:
-                        file_path = os.path.join(root, file_name)
-                        contents.append(file_path)
-        else:
-            with os.scandir(directory) as entries:
-                for entry in entries:
-                    if (entry.is_file() and include_files) or (entry.is_dir() an
+    return list(iter_directory_contents(directory, include_files, include_dirs, recursive))
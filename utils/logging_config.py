@@ -1,48 +1,215 @@
 """Logging configuration for the application."""
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 
+# Directory that receives the log files
+LOGS_DIR = Path('logs')
+
+# Set once setup_logging has installed the handlers
+_CONFIGURED = False
+
+# Size at which the log file is rotated, and how many rotated files to keep
+LOG_FILE_MAX_BYTES = 50 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+# Records buffered before the log file is written (errors are written at once)
+FILE_BUFFER_CAPACITY = 512
+
+# Seconds between flushes of the log file buffer
+FILE_FLUSH_INTERVAL = 1.0
+
+# Bytes buffered by the binary log file writer
+FILE_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler writing encoded records to a large binary buffer.
+    
+    Records are encoded once and appended to a buffered binary file, which
+    is only flushed on ERROR records, by flush() or on close (not after
+    every record like FileHandler).
+    """
+    
+    def _open(self):
+        """Open the log file for buffered binary appends."""
+        return open(self.baseFilename, 'ab', buffering=FILE_WRITE_BUFFER_SIZE)
+    
+    def emit(self, record):
+        """Encode and write a record, rolling the file over when it is full."""
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding or "utf-8", self.errors or "strict")
+            
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                    
+            self.stream.write(data)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+                
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Stream handler that only flushes after WARNING and higher records.
+    
+    A terminal stdout is line-buffered and shows every record anyway; when
+    stdout is redirected this saves a flush per INFO record.
+    """
+    
+    def flush(self):
+        """Leave flushing to the stream's own buffering."""
+        pass
+    
+    def emit(self, record):
+        """Write a record, flushing the stream for warnings and errors."""
+        super().emit(record)
+        if record.levelno >= logging.WARNING:
+            super().flush()
+
+
+def _flush_periodically(handlers, interval, stop_event):
+    """Flush handlers (in order) every interval seconds until stop_event is set."""
+    while not stop_event.wait(interval):
+        for handler in handlers:
+            handler.flush()
+
 
 def setup_logging(log_level=logging.INFO, log_to_file=True):
     """Set up logging configuration.
     
+    Records are handed to a background thread through a queue, so logging
+    calls never wait on console or file I/O. Only the first call installs
+    handlers; later calls just update the log level.
+    
     Args:
         log_level: Logging level (default: INFO)
         log_to_file: Whether to log to file in addition to console
     """
+    global _CONFIGURED
+    
     # Create logger
     logger = logging.getLogger()
     logger.setLevel(log_level)
     
+    if _CONFIGURED:
+        return logger
+    
+    # Drop handlers left over from an earlier configuration (e.g. a module
+    # reload or basicConfig) so records are not emitted twice
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    
+    # The format below uses none of the thread/process fields, so skip
+    # collecting them for every record (logAsyncioTasks exists from Python 3.12)
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+    
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
     # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = ConsoleHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # Create file handler if requested
+    log_file = None
     if log_to_file:
         # Create logs directory if it doesn't exist
-        logs_dir = Path('logs')
-        logs_dir.mkdir(exist_ok=True)
+        LOGS_DIR.mkdir(exist_ok=True)
         
         # Create log file with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = logs_dir / f"oracle_etl_{timestamp}.log"
+        log_file = LOGS_DIR / f"oracle_etl_{timestamp}.log"
         
-        # Create file handler
-        file_handler = logging.FileHandler(log_file)
+        # Create file handler, buffered so records reach the disk in batches
+        # (the file is only opened when the first record is written)
+        file_handler = BufferedRotatingFileHandler(
+            log_file,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True
+        )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        
-        logger.info(f"Logging to file: {log_file}")
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=FILE_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        handlers.append(buffered_handler)
+    
+    # Write records from a background thread
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    
+    # Bound how long a buffered record can wait before it is written
+    stop_flushing = threading.Event()
+    if log_file is not None:
+        threading.Thread(
+            target=_flush_periodically,
+            args=((buffered_handler, file_handler), FILE_FLUSH_INTERVAL, stop_flushing),
+            name="log-flush",
+            daemon=True
+        ).start()
+    
+    def _stop_logging():
+        """Drain the queue and write out buffered records at exit."""
+        stop_flushing.set()
+        listener.stop()
+        for handler in handlers:
+            handler.flush()
+        if log_file is not None:
+            file_handler.flush()
+    
+    atexit.register(_stop_logging)
+    
+    # Announce the log file on the console only; logging it through the file
+    # handler would open the file straight away and defeat delay=True
+    if log_file is not None and logger.isEnabledFor(logging.INFO):
+        console_handler.handle(logger.makeRecord(
+            __name__, logging.INFO, __file__, 0, "Logging to file: %s", (log_file,), None
+        ))
     
+    _CONFIGURED = True
     return logger
+
+
+def setup_worker_logging(log_queue, log_level=logging.INFO):
+    """Send a worker process's log records to the parent through log_queue.
+    
+    Used as a process pool initializer; the parent forwards the records from
+    log_queue to its own handlers with a QueueListener.
+    
+    Args:
+        log_queue: multiprocessing queue read by the parent process
+        log_level: Logging level (default: INFO)
+    """
+    logger = logging.getLogger()
+    logger.setLevel(log_level)
+    
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))